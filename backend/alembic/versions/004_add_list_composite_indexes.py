@@ -0,0 +1,38 @@
+"""Add composite indexes for list endpoint filters
+
+Revision ID: 004_list_composite_indexes
+Revises: 003_fabric_ca_enrollment
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_list_composite_indexes'
+down_revision = '003_fabric_ca_enrollment'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite indexes matching list endpoint filters + ordering
+    op.create_index('ix_chaincodes_status_created_at', 'chaincodes', ['status', 'created_at'])
+    op.create_index('ix_deployments_status_created_at', 'deployments', ['deployment_status', 'created_at'])
+    op.create_index('ix_audit_user_ts', 'audit_logs', ['user_id', 'timestamp'])
+    op.create_index('ix_audit_resource', 'audit_logs', ['resource_type', 'resource_id', 'timestamp'])
+    
+    # Single-column indexes now covered by the leading column above
+    op.drop_index('ix_chaincodes_status', table_name='chaincodes')
+    op.drop_index('ix_deployments_deployment_status', table_name='deployments')
+    op.drop_index('ix_audit_logs_resource_type', table_name='audit_logs')
+
+
+def downgrade():
+    op.create_index('ix_audit_logs_resource_type', 'audit_logs', ['resource_type'])
+    op.create_index('ix_deployments_deployment_status', 'deployments', ['deployment_status'])
+    op.create_index('ix_chaincodes_status', 'chaincodes', ['status'])
+    
+    op.drop_index('ix_audit_resource', table_name='audit_logs')
+    op.drop_index('ix_audit_user_ts', table_name='audit_logs')
+    op.drop_index('ix_deployments_status_created_at', table_name='deployments')
+    op.drop_index('ix_chaincodes_status_created_at', table_name='chaincodes')
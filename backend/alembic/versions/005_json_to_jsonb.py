@@ -0,0 +1,39 @@
+"""Store JSON columns as JSONB and add a GIN index for team member filters
+
+Revision ID: 005_jsonb_columns
+Revises: 004_list_composite_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005_jsonb_columns'
+down_revision = '004_list_composite_indexes'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = [
+    ('audit_logs', 'details'),
+    ('chaincodes', 'chaincode_metadata'),
+    ('deployments', 'target_peers'),
+    ('deployments', 'deployment_metadata'),
+    ('channels', 'organizations'),
+    ('projects', 'team_members'),
+    ('projects', 'settings'),
+]
+
+
+def upgrade():
+    for table, column in JSON_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb')
+    
+    # GIN index for @> containment filters on project team members
+    op.create_index('ix_project_members_gin', 'projects', ['team_members'], postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_project_members_gin', table_name='projects')
+    
+    for table, column in JSON_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE json USING {column}::json')
@@ -0,0 +1,112 @@
+"""Partition audit_logs by month on timestamp
+
+Revision ID: 006_partition_audit_logs
+Revises: 005_jsonb_columns
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006_partition_audit_logs'
+down_revision = '005_jsonb_columns'
+branch_labels = None
+depends_on = None
+
+AUDIT_INDEXES = [
+    'ix_audit_logs_action',
+    'ix_audit_logs_resource_id',
+    'ix_audit_logs_timestamp',
+    'ix_audit_user_ts',
+    'ix_audit_resource',
+]
+
+
+def _create_indexes():
+    op.create_index('ix_audit_logs_action', 'audit_logs', ['action'])
+    op.create_index('ix_audit_logs_resource_id', 'audit_logs', ['resource_id'])
+    op.create_index('ix_audit_logs_timestamp', 'audit_logs', ['timestamp'])
+    op.create_index('ix_audit_user_ts', 'audit_logs', ['user_id', 'timestamp'])
+    op.create_index('ix_audit_resource', 'audit_logs', ['resource_type', 'resource_id', 'timestamp'])
+
+
+def upgrade():
+    # Move the existing table aside, freeing its index and constraint names
+    for name in AUDIT_INDEXES:
+        op.drop_index(name, table_name='audit_logs')
+    op.execute('ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned')
+    op.execute('ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey')
+    
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID NOT NULL,
+            user_id UUID REFERENCES users (id),
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(50),
+            resource_id VARCHAR(255),
+            details JSONB,
+            ip_address INET,
+            user_agent TEXT,
+            timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT')
+    
+    # Monthly partitions covering existing rows through three months ahead
+    op.execute("""
+        DO $$
+        DECLARE
+            month DATE;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(COALESCE(MIN(timestamp), now()), now())),
+                    date_trunc('month', now()) + interval '3 months',
+                    interval '1 month'
+                )::date
+                FROM audit_logs_unpartitioned
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE audit_logs_%s PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    _create_indexes()
+    
+    op.execute("""
+        INSERT INTO audit_logs
+        SELECT id, user_id, action, resource_type, resource_id, details, ip_address, user_agent,
+               COALESCE(timestamp, now())
+        FROM audit_logs_unpartitioned
+    """)
+    op.execute('DROP TABLE audit_logs_unpartitioned')
+
+
+def downgrade():
+    op.execute('ALTER TABLE audit_logs RENAME TO audit_logs_partitioned')
+    for name in AUDIT_INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_partitioned')
+    op.execute('ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey')
+    
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID PRIMARY KEY,
+            user_id UUID REFERENCES users (id),
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(50),
+            resource_id VARCHAR(255),
+            details JSONB,
+            ip_address INET,
+            user_agent TEXT,
+            timestamp TIMESTAMPTZ DEFAULT now()
+        )
+    """)
+    _create_indexes()
+    op.execute('INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned')
+    
+    # Dropping the parent drops every partition with it
+    op.execute('DROP TABLE audit_logs_partitioned')
@@ -0,0 +1,53 @@
+"""Convert status and role columns to native ENUM types
+
+Revision ID: 007_status_enum_types
+Revises: 006_partition_audit_logs
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007_status_enum_types'
+down_revision = '006_partition_audit_logs'
+branch_labels = None
+depends_on = None
+
+# (table, column, enum type name, values, default)
+ENUM_COLUMNS = [
+    ('chaincodes', 'status', 'chaincode_status',
+     ('uploaded', 'validated', 'invalid', 'approved', 'rejected', 'deployed', 'active', 'deprecated'), None),
+    ('approvals', 'approval_status', 'approval_status', ('pending', 'approved', 'rejected'), None),
+    ('deployments', 'deployment_status', 'deployment_status',
+     ('pending', 'deploying', 'success', 'failed', 'rolled_back'), None),
+    ('channels', 'status', 'channel_status', ('pending', 'active', 'inactive', 'deleted'), None),
+    ('projects', 'status', 'project_status', ('active', 'inactive', 'archived', 'deleted'), None),
+    ('users', 'role', 'user_role', ('ADMIN', 'ORG_ADMIN', 'USER', 'VIEWER'), None),
+    ('users', 'status', 'user_status',
+     ('active', 'inactive', 'suspended', 'pending', 'enrollment_failed', 'enrollment_error',
+      'revoked', 'certificate_revoked'), None),
+    ('users', 'fabric_enrollment_status', 'fabric_enrollment_status',
+     ('pending', 'enrolled', 'failed', 'revoked'), 'pending'),
+]
+
+
+def upgrade():
+    for table, column, type_name, values, default in ENUM_COLUMNS:
+        postgresql.ENUM(*values, name=type_name).create(op.get_bind(), checkfirst=True)
+        # A varchar server default cannot be cast automatically; drop and restore it
+        if default is not None:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}')
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
+
+
+def downgrade():
+    for table, column, type_name, values, default in reversed(ENUM_COLUMNS):
+        if default is not None:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(20) USING {column}::text')
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
+        postgresql.ENUM(name=type_name).drop(op.get_bind(), checkfirst=True)
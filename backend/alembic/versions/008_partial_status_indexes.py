@@ -0,0 +1,37 @@
+"""Replace low-selectivity status indexes with partial indexes
+
+Revision ID: 008_partial_status_indexes
+Revises: 007_status_enum_types
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_partial_status_indexes'
+down_revision = '007_status_enum_types'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Only the values the stats queries count on
+    op.create_index('ix_channels_status_open', 'channels', ['status'],
+                    postgresql_where=sa.text("status IN ('pending', 'active')"))
+    op.create_index('ix_projects_status_live', 'projects', ['status'],
+                    postgresql_where=sa.text("status IN ('active', 'inactive')"))
+    
+    op.drop_index('ix_channels_status', table_name='channels')
+    op.drop_index('ix_projects_status', table_name='projects')
+    # Never filtered on
+    op.drop_index('ix_approvals_approval_status', table_name='approvals')
+
+
+def downgrade():
+    op.create_index('ix_approvals_approval_status', 'approvals', ['approval_status'])
+    op.create_index('ix_projects_status', 'projects', ['status'])
+    op.create_index('ix_channels_status', 'channels', ['status'])
+    
+    op.drop_index('ix_projects_status_live', table_name='projects')
+    op.drop_index('ix_channels_status_open', table_name='channels')
@@ -0,0 +1,25 @@
+"""Index audit_logs by action for newest-first keyset pages
+
+Revision ID: 009_audit_action_ts
+Revises: 008_partial_status_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_audit_action_ts'
+down_revision = '008_partial_status_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves WHERE action = ? ORDER BY timestamp DESC; covers the old action index
+    op.create_index('ix_audit_action_ts', 'audit_logs', ['action', 'timestamp'])
+    op.drop_index('ix_audit_logs_action', table_name='audit_logs')
+
+
+def downgrade():
+    op.create_index('ix_audit_logs_action', 'audit_logs', ['action'])
+    op.drop_index('ix_audit_action_ts', table_name='audit_logs')
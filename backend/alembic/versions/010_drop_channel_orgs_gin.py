@@ -0,0 +1,24 @@
+"""Drop the unused GIN index on channels.organizations
+
+Revision ID: 010_drop_channel_orgs_gin
+Revises: 009_audit_action_ts
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010_drop_channel_orgs_gin'
+down_revision = '009_audit_action_ts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Earlier revisions of 005 created it; nothing filters on channel organizations
+    op.execute('DROP INDEX IF EXISTS ix_channel_orgs_gin')
+
+
+def downgrade():
+    # 005 no longer creates the index, so there is nothing to restore
+    pass
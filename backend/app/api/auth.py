@@ -9,19 +9,19 @@ from app.schemas.auth import LoginRequest, Token, RefreshTokenRequest
 from app.services.auth_service import AuthService
 from app.middleware.auth import oauth2_scheme
 from app.middleware.rbac import get_current_user
-from app.middleware.rate_limit import login_rate_limit
+from app.core.token_cache import verification_cache
 from app.config import settings
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=Token, dependencies=[Depends(login_rate_limit)])
+@router.post("/login", response_model=Token)
 async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    """Login with username and password - Rate limited to prevent brute force attacks"""
+    """Login with username and password - Rate limited by RateLimitMiddleware to prevent brute force attacks"""
     auth_service = AuthService(db)
     user = auth_service.authenticate_user(form_data.username, form_data.password)
     
@@ -39,9 +39,9 @@ async def login(
     tokens = auth_service.create_tokens(user)
     
     # Create response with httpOnly cookies for better security
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import ORJSONResponse
     
-    response = JSONResponse(content={
+    response = ORJSONResponse(content={
         "access_token": tokens.access_token,
         "refresh_token": tokens.refresh_token,
         "token_type": "bearer",
@@ -83,12 +83,15 @@ def refresh_token(
 
 @router.post("/logout")
 def logout(
+    token: str = Depends(oauth2_scheme),
     current_user = Depends(get_current_user)
 ):
     """Logout user - Clear httpOnly cookies"""
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import ORJSONResponse
     
-    response = JSONResponse(content={"message": "Successfully logged out"})
+    verification_cache.invalidate(token)
+    
+    response = ORJSONResponse(content={"message": "Successfully logged out"})
     
     # Clear the httpOnly cookies
     response.delete_cookie(key="access_token")
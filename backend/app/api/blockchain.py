@@ -3,6 +3,8 @@ Blockchain Explorer API Routes
 Provides endpoints to view blocks, transactions, and blockchain metadata
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.database import get_db
 from app.middleware.rbac import get_current_user
 from app.models.user import User
 from app.services.blockchain_service import BlockchainService
@@ -260,7 +262,8 @@ async def get_transaction_details(
 @router.get("/statistics")
 async def get_blockchain_statistics(
     channel_name: str = Query("ibnchannel"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Get blockchain statistics and metrics
@@ -276,10 +279,8 @@ async def get_blockchain_statistics(
         info = await service.get_channel_info(channel_name)
         
         # Get chaincode count from database
-        from app.database import get_db
         from app.models.chaincode import Chaincode
         
-        db = next(get_db())
         chaincode_count = db.query(Chaincode).filter(
             Chaincode.status == "active"
         ).count()
@@ -2,7 +2,7 @@
 Backend Phase 3 - Certificate Management Routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from uuid import UUID
 from app.database import get_db
 from app.services.certificate_service import CertificateService
@@ -278,7 +278,7 @@ async def get_user_certificate(
     db: Session = Depends(get_db)
 ):
     """Get user certificate information (Admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(undefer_group("pem")).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
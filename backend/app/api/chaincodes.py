@@ -8,7 +8,7 @@ from uuid import UUID
 from app.database import get_db
 from app.schemas.chaincode import (
     Chaincode as ChaincodeSchema, ChaincodeUpload, ChaincodeUpdate, 
-    ChaincodeDeploy, ChaincodeInvoke, ChaincodeQuery, ChaincodeList
+    ChaincodeDeploy, ChaincodeInvoke, ChaincodeQuery, ChaincodeList, CHAINCODES_ADAPTER
 )
 from app.models.chaincode import Chaincode as ChaincodeModel
 from app.services.chaincode_service import ChaincodeService
@@ -241,7 +241,7 @@ def get_chaincodes(
     total = total_query.count()
     
     return ChaincodeList(
-        chaincodes=chaincodes,
+        chaincodes=CHAINCODES_ADAPTER.validate_python(chaincodes, from_attributes=True),
         total=total,
         page=skip // limit + 1,
         size=limit
@@ -7,7 +7,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
 from app.database import get_db
-from app.schemas.channel import ChannelCreate, ChannelUpdate, ChannelResponse, ChannelList, ChannelStats
+from app.schemas.channel import (
+    ChannelCreate, ChannelUpdate, ChannelResponse, ChannelList, ChannelStats, CHANNELS_ADAPTER
+)
 from app.services.channel_service import ChannelService
 from app.middleware.rbac import get_current_user, require_permission
 from app.models.user import User
@@ -36,7 +38,7 @@ async def get_channels(
         
         logger.info(f"Retrieved {len(channels)} channels out of {total} total")
         return ChannelList(
-            channels=channels,
+            channels=CHANNELS_ADAPTER.validate_python(channels, from_attributes=True),
             total=total,
             skip=skip,
             limit=limit
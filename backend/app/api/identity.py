@@ -3,7 +3,7 @@ Backend Phase 3 - Identity API for Fabric Gateway
 Provides user identities (certificates) to Fabric Gateway service
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from typing import Optional
 from app.database import get_db
 from app.models.user import User
@@ -50,10 +50,10 @@ async def get_user_identity(
         try:
             from uuid import UUID
             user_id = UUID(user_identifier)
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.query(User).options(undefer_group("pem")).filter(User.id == user_id).first()
         except ValueError:
             # Not a UUID, try username
-            user = db.query(User).filter(User.username == user_identifier).first()
+            user = db.query(User).options(undefer_group("pem")).filter(User.username == user_identifier).first()
         
         if not user:
             raise HTTPException(
@@ -7,7 +7,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
 from app.database import get_db
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectList, ProjectStats
+from app.schemas.project import (
+    ProjectCreate, ProjectUpdate, ProjectResponse, ProjectList, ProjectStats, PROJECTS_ADAPTER
+)
 from app.services.project_service import ProjectService
 from app.middleware.rbac import get_current_user, require_permission
 from app.models.user import User
@@ -28,7 +30,7 @@ async def get_projects(
     projects = project_service.get_projects(skip=skip, limit=limit, user_id=str(current_user.id))
     
     return ProjectList(
-        projects=projects,
+        projects=PROJECTS_ADAPTER.validate_python(projects, from_attributes=True),
         total=len(projects),
         skip=skip,
         limit=limit
@@ -1,18 +1,25 @@
 """
 Backend Phase 3 - User Management Routes
 """
+import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 from app.database import get_db
-from app.schemas.user import User, UserCreate, UserUpdate, UserList
+from app.schemas.user import (
+    User, UserCreate, UserUpdate, UserList, UserRole, UserStatus, UserBulkDeactivate,
+    USERS_ADAPTER
+)
 from app.services.user_service import UserService
 from app.middleware.rbac import (
     get_current_user, require_admin, require_org_admin, require_user_manage
 )
 from app.models.user import User as UserModel
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -23,24 +30,22 @@ def create_user(
     db: Session = Depends(get_db)
 ):
     """Create a new user (Admin only)"""
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"Creating user with data: {user_data.dict()}")
+    logger.info("Creating user %s", user_data.username)
     
     user_service = UserService(db)
     
     try:
         result = user_service.create_user(user_data, created_by=current_user.id)
-        logger.info(f"User created successfully: {result.username}")
+        logger.info("User created successfully: %s", result.username)
         return result
     except ValueError as e:
-        logger.error(f"ValueError creating user: {str(e)}")
+        logger.error("ValueError creating user: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Unexpected error creating user: {str(e)}", exc_info=True)
+        logger.error("Unexpected error creating user: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user: {str(e)}"
@@ -51,8 +56,8 @@ def create_user(
 def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    role: Optional[str] = Query(None),
-    status: Optional[str] = Query(None),
+    role: Optional[UserRole] = Query(None),
+    status: Optional[UserStatus] = Query(None),
     organization: Optional[str] = Query(None),
     include_inactive: bool = Query(False, description="Include deactivated/deleted users"),
     current_user: UserModel = Depends(require_user_manage),
@@ -65,6 +70,8 @@ def get_users(
     Set include_inactive=true to see deactivated users.
     """
     user_service = UserService(db)
+    role = role.value if role else None
+    status = status.value if status else None
     
     users = user_service.get_users(
         skip=skip,
@@ -93,31 +100,54 @@ def get_users(
     total = total_query.count()
     
     return UserList(
-        users=users,
+        users=USERS_ADAPTER.validate_python(users, from_attributes=True),
         total=total,
         page=skip // limit + 1,
         size=limit
     )
 
 
+@router.get("/stream")
+def stream_users(
+    role: Optional[UserRole] = Query(None),
+    status: Optional[UserStatus] = Query(None),
+    organization: Optional[str] = Query(None),
+    include_inactive: bool = Query(False, description="Include deactivated/deleted users"),
+    current_user: UserModel = Depends(require_user_manage),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream users as NDJSON, one User object per line (Admin only)
+    
+    Unlike GET /users, the result is not paginated or buffered: rows are
+    read in batches and written out as they arrive.
+    """
+    user_service = UserService(db)
+    users = user_service.iter_users(
+        role=role.value if role else None,
+        status=status.value if status else None,
+        organization=organization,
+        include_inactive=include_inactive
+    )
+    
+    def _ndjson():
+        for user in users:
+            yield User.model_validate(user).model_dump_json().encode() + b"\n"
+    
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
 @router.get("/role/{role}", response_model=List[User])
 def get_users_by_role(
-    role: str,
+    role: UserRole,
     current_user: UserModel = Depends(require_user_manage),
     db: Session = Depends(get_db)
 ):
     """Get users by role (Admin only)"""
     user_service = UserService(db)
     
-    # Validate role
-    allowed_roles = ['ADMIN', 'ORG_ADMIN', 'USER', 'VIEWER']
-    if role not in allowed_roles:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid role. Must be one of: {allowed_roles}"
-        )
-    
-    return user_service.get_users_by_role(role)
+    # Role is validated by FastAPI against UserRole (422 on unknown values)
+    return user_service.get_users_by_role(role.value)
 
 
 @router.get("/organization/{organization}", response_model=List[User])
@@ -208,7 +238,13 @@ def deactivate_user(
     current_user: UserModel = Depends(require_user_manage),
     db: Session = Depends(get_db)
 ):
-    """Deactivate a user (Admin only)"""
+    """
+    Deactivate (soft delete) a user (Admin only)
+    This will:
+    - Revoke certificate on Fabric CA
+    - Deactivate user in Database
+    - User can be reactivated later
+    """
     user_service = UserService(db)
     
     user = user_service.deactivate_user(user_id, deactivated_by=current_user.id)
@@ -221,6 +257,33 @@ def deactivate_user(
     return user
 
 
+# DELETE /{user_id} is a soft delete and shares the deactivate handler
+router.add_api_route(
+    "/{user_id}",
+    deactivate_user,
+    methods=["DELETE"],
+    response_model=User,
+)
+
+
+@router.post("/bulk-deactivate")
+def bulk_deactivate_users(
+    request_data: UserBulkDeactivate,
+    current_user: UserModel = Depends(require_user_manage),
+    db: Session = Depends(get_db)
+):
+    """
+    Deactivate several users at once (Admin only)
+    Certificates are revoked on Fabric CA concurrently instead of one
+    request per user.
+    """
+    user_service = UserService(db)
+    return user_service.bulk_deactivate_users(
+        request_data.user_ids,
+        deactivated_by=current_user.id
+    )
+
+
 @router.post("/{user_id}/retry-enrollment")
 def retry_user_enrollment(
     user_id: UUID,
@@ -249,34 +312,6 @@ def retry_user_enrollment(
     }
 
 
-@router.delete("/{user_id}")
-def delete_user(
-    user_id: UUID,
-    current_user: UserModel = Depends(require_user_manage),
-    db: Session = Depends(get_db)
-):
-    """
-    Soft delete (deactivate) a user
-    This will:
-    - Revoke certificate on Fabric CA
-    - Deactivate user in Database
-    - User can be reactivated later
-    """
-    user_service = UserService(db)
-    user = user_service.deactivate_user(user_id, deactivated_by=current_user.id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    return {
-        "success": True, 
-        "message": "User deactivated and certificate revoked", 
-        "user_id": str(user_id),
-        "certificate_revoked": user.certificate_id is None
-    }
-
-
 @router.delete("/{user_id}/permanent")
 def delete_user_permanently(
     user_id: UUID,
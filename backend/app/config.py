@@ -37,12 +37,27 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Verified access tokens are trusted for this many seconds (never past exp)
+    JWT_CACHE_TTL: float = 5.0
+    JWT_CACHE_SIZE: int = 10_000
     
     # API Configuration
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Blockchain Gateway Backend"
     VERSION: str = "3.0.0"
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
+    # Run Base.metadata.create_all() on startup. There is no Alembic baseline
+    # migration yet, so this creates the schema on a fresh database; set to
+    # False once the schema exists to skip the per-boot catalog introspection.
+    AUTO_CREATE_SCHEMA: bool = os.getenv("AUTO_CREATE_SCHEMA", "True").lower() == "true"
+    
+    # Uvicorn worker processes (same env var uvicorn's --workers reads).
+    # Keep at 1 unless Socket.IO state is shared across workers.
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    
+    # Keep rate limiting windows in Redis so limits hold across workers/pods.
+    # Falls back to per-process limits while Redis is unreachable.
+    RATE_LIMIT_REDIS: bool = os.getenv("RATE_LIMIT_REDIS", "True").lower() == "true"
     
     # CORS Configuration  
     # Allow frontend, API gateway, and localhost for development
@@ -60,6 +75,9 @@ class Settings(BaseSettings):
     FABRIC_CA_ADMIN_USERNAME: str = "admin"
     FABRIC_CA_ADMIN_PASSWORD: str = "adminpw"
     FABRIC_CA_TLS_ENABLED: bool = False
+    FABRIC_CA_TLS_CERTFILE: str = "/fabric-certs/ca-org1-tls.pem"
+    # Register/enroll/revoke over the CA REST API; False falls back to fabric-ca-client
+    FABRIC_CA_USE_REST: bool = os.getenv("FABRIC_CA_USE_REST", "True").lower() == "true"
     FABRIC_CA_ADMIN_CERT: Optional[str] = None
     FABRIC_CA_ADMIN_KEY: Optional[str] = None
     
@@ -0,0 +1,154 @@
+"""
+Shared HTTP Client
+Provides a pooled httpx.AsyncClient so outbound calls to the Fabric Gateway
+and Fabric CA reuse keep-alive connections instead of reconnecting per call.
+
+Fabric CA calls get their own client (get_ca_http_client) bound to the CA
+base URL, admin credentials and an SSL context that trusts the CA's TLS root.
+Its transport resolves the CA hostname once per DNS_CACHE_TTL, since Docker's
+embedded DNS is queried on every new connection otherwise.
+
+Clients are kept per event loop: an AsyncClient's pool is bound to the loop
+that opened its connections, and some services still run coroutines under a
+throwaway asyncio.run() loop. Those go through run_with_clients(), which
+closes that loop's clients before it exits.
+"""
+import asyncio
+import functools
+import ipaddress
+import os
+import socket
+import ssl
+import time
+import weakref
+from typing import Dict, Tuple
+
+import httpx
+
+from app.config import settings
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+# Connection attempts retried with exponential backoff (connect errors only,
+# so a request is never sent twice)
+CONNECT_RETRIES = 3
+CA_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+DNS_CACHE_TTL = 60.0
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_ca_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_trusted_ca_files = set()
+_resolved_hosts: Dict[str, Tuple[str, float]] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(limits=DEFAULT_LIMITS, retries=CONNECT_RETRIES)
+        )
+        _clients[loop] = client
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def _ca_ssl_context() -> ssl.SSLContext:
+    """SSL context trusting the Fabric CA TLS root; loading CA files is slow, so build once"""
+    certfile = settings.FABRIC_CA_TLS_CERTFILE
+    if certfile and os.path.exists(certfile):
+        return ssl.create_default_context(cafile=certfile)
+    return ssl.create_default_context()
+
+
+def add_ca_trust(certfile: str):
+    """Trust another CA TLS root (e.g. a second organization's CA) on the CA client"""
+    if certfile not in _trusted_ca_files:
+        _ca_ssl_context().load_verify_locations(cafile=certfile)
+        _trusted_ca_files.add(certfile)
+
+
+async def _resolve_host(host: str) -> str:
+    """IPv4 address for a hostname, cached for DNS_CACHE_TTL; the host itself for IPs or on failure"""
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    entry = _resolved_hosts.get(host)
+    if entry is not None and entry[1] > time.monotonic():
+        return entry[0]
+    try:
+        address = await asyncio.to_thread(socket.gethostbyname, host)
+    except OSError:
+        return host
+    _resolved_hosts[host] = (address, time.monotonic() + DNS_CACHE_TTL)
+    return address
+
+
+class _CachedDNSTransport(httpx.AsyncHTTPTransport):
+    """
+    Connects to the cached address of the request host.
+
+    The Host header and TLS SNI/certificate check still use the hostname
+    (the CA's TLS cert has a SAN for ca-org1, not its IP). A failed connect
+    drops the cached address so the next attempt resolves again.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        address = await _resolve_host(host)
+        if address == host:
+            return await super().handle_async_request(request)
+
+        # Headers (including Host) are copied as built from the original URL
+        resolved = httpx.Request(
+            request.method,
+            request.url.copy_with(host=address),
+            headers=request.headers,
+            stream=request.stream,
+            extensions={**request.extensions, "sni_hostname": host}
+        )
+        try:
+            return await super().handle_async_request(resolved)
+        except httpx.ConnectError:
+            _resolved_hosts.pop(host, None)
+            raise
+
+
+def get_ca_http_client() -> httpx.AsyncClient:
+    """Get the Fabric CA AsyncClient (relative URLs, admin auth) for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _ca_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=settings.FABRIC_CA_URL,
+            auth=(settings.FABRIC_CA_ADMIN_USERNAME, settings.FABRIC_CA_ADMIN_PASSWORD),
+            timeout=DEFAULT_TIMEOUT,
+            transport=_CachedDNSTransport(
+                verify=_ca_ssl_context(), limits=CA_LIMITS, retries=CONNECT_RETRIES
+            )
+        )
+        _ca_clients[loop] = client
+    return client
+
+
+def run_with_clients(coro):
+    """asyncio.run() a coroutine, closing the clients it opened on that loop"""
+    async def _run():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+    return asyncio.run(_run())
+
+
+async def close_http_client():
+    """Close the running loop's clients (application shutdown)"""
+    loop = asyncio.get_running_loop()
+    for clients in (_clients, _ca_clients):
+        client = clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
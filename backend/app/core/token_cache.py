@@ -0,0 +1,65 @@
+"""
+Access Token Verification Cache
+Remembers recently verified access tokens for a few seconds so repeated
+requests with the same bearer token skip JWT decode and signature checks.
+
+Entries are keyed on a BLAKE2b digest of the token (the raw token is never
+stored) and never outlive the token's own exp claim.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config import settings
+
+
+class VerificationCache:
+    """Thread-safe bounded LRU of token digest -> (user_id, expires_at)"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        """Return the cached user ID for a token, or None on miss/expiry"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, token: str, user_id: str, exp: float):
+        """Remember a verified token until min(now + ttl, exp)"""
+        expires_at = min(time.time() + self.ttl, exp)
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        """Forget a token (e.g. on logout)"""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Global verification cache instance
+verification_cache = VerificationCache(settings.JWT_CACHE_SIZE, settings.JWT_CACHE_TTL)
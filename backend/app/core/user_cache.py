@@ -0,0 +1,96 @@
+"""
+Authenticated User Cache
+Caches the User row looked up by get_current_user in Redis, keyed by user ID,
+so protected endpoints skip the per-request SELECT.
+
+Secrets (password hash, private key, enrollment secret) are never cached.
+Entries are invalidated whenever a User is flushed or deleted through the ORM;
+code issuing Core UPDATE/DELETE statements must call invalidate_cached_users().
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+import orjson
+from sqlalchemy import DateTime, event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.redis import get_redis_client
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "auth:user:"
+TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+_SECRET_COLUMNS = frozenset({"password_hash", "private_key_pem", "fabric_enrollment_secret"})
+# Deferred on User and never read from the current user
+_UNUSED_COLUMNS = frozenset({"public_key_pem"})
+_CACHED_COLUMNS = tuple(
+    column.key for column in User.__table__.columns
+    if column.key not in _SECRET_COLUMNS and column.key not in _UNUSED_COLUMNS
+)
+_DATETIME_COLUMNS = frozenset(
+    column.key for column in User.__table__.columns if isinstance(column.type, DateTime)
+)
+
+
+def get_cached_user(user_id: str) -> Optional[User]:
+    """Return a detached User snapshot from cache, or None on miss"""
+    try:
+        cached = get_redis_client().get(KEY_PREFIX + str(user_id))
+    except Exception:
+        return None
+    if not cached:
+        return None
+
+    data = orjson.loads(cached)
+    data["id"] = UUID(data["id"])
+    for key in _DATETIME_COLUMNS:
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    return User(**data)
+
+
+def cache_user(user: User) -> None:
+    """Store a snapshot of the user's non-secret columns"""
+    data = {key: getattr(user, key) for key in _CACHED_COLUMNS}
+    try:
+        get_redis_client().setex(KEY_PREFIX + str(user.id), TTL_SECONDS, orjson.dumps(data))
+    except Exception as e:
+        logger.debug("Failed to cache user %s: %s", user.id, e)
+
+
+def invalidate_cached_users(user_ids: Iterable) -> None:
+    """Drop cached snapshots for the given user IDs"""
+    keys = [KEY_PREFIX + str(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    try:
+        get_redis_client().delete(*keys)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached users: {e}")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = {
+        obj.id for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    }
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    changed = session.info.pop("changed_user_ids", None)
+    if changed:
+        invalidate_cached_users(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -1,29 +1,49 @@
 """
 Backend Phase 3 - Database Connection
 """
+from contextvars import ContextVar
+from typing import Optional
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from app.config import settings
 
+
+def _json_dumps(value) -> str:
+    """orjson encoder for JSON/JSONB columns (drivers expect str)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Synchronous database
 # SECURITY: Only echo SQL in safe development mode (never in production)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_recycle=300,
-    echo=settings.SAFE_DATABASE_LOGGING  # Changed from settings.DEBUG
+    echo=settings.SAFE_DATABASE_LOGGING,  # Changed from settings.DEBUG
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request-scoped sessions
+# The scope key is set per HTTP request by DBSessionScopeMiddleware. A
+# ContextVar is used instead of the thread-local default because FastAPI runs
+# sync dependencies and their teardown on arbitrary threadpool threads.
+request_scope: ContextVar[Optional[object]] = ContextVar("db_request_scope", default=None)
+ScopedSession = scoped_session(SessionLocal, scopefunc=request_scope.get)
+
 # Asynchronous database
 async_engine = create_async_engine(
     settings.DATABASE_URL_ASYNC,
     pool_pre_ping=True,
     pool_recycle=300,
-    echo=settings.SAFE_DATABASE_LOGGING  # Changed from settings.DEBUG
+    echo=settings.SAFE_DATABASE_LOGGING,  # Changed from settings.DEBUG
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -36,12 +56,21 @@ Base = declarative_base()
 
 
 def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
+    """Dependency to get the request-scoped database session"""
+    if request_scope.get() is None:
+        # Outside an HTTP request (scripts, tests): plain session
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+    
+    db = ScopedSession()
     try:
         yield db
     finally:
-        db.close()
+        ScopedSession.remove()
 
 
 async def get_async_db():
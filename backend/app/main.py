@@ -4,15 +4,24 @@ Backend Phase 3 - Main FastAPI Application
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
+import asyncio
 import time
 from app.config import settings
 from app.api import auth, chaincodes, users, deployments, certificates, channels, projects, identity, blockchain
 from app.database import engine
 from app.models import *  # Import all models
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.middleware.db_session import DBSessionScopeMiddleware
+from app.middleware.timing import ProcessTimeMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, rate_limiter
 from app.services.websocket_service import websocket_service
+from app.services.audit_service import audit_batcher, ensure_audit_log_partitions, run_partition_maintainer
+from app.core.http_client import close_http_client
 
 
 @asynccontextmanager
@@ -22,14 +31,32 @@ async def lifespan(app: FastAPI):
     print("Starting Blockchain Gateway Backend...")
     
     # Create database tables
-    from app.database import Base
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created/verified")
+    if settings.AUTO_CREATE_SCHEMA:
+        from app.database import Base
+        Base.metadata.create_all(bind=engine)
+        print("Database tables created/verified")
+    
+    # Monthly audit_logs partitions (idempotent), also for migrated deployments;
+    # re-checked daily so the months ahead always exist
+    await asyncio.to_thread(ensure_audit_log_partitions, engine)
+    partition_maintainer = asyncio.create_task(run_partition_maintainer(engine))
+    
+    # Prune idle clients from the in-process rate limiter
+    sweeper = asyncio.create_task(rate_limiter.run_sweeper())
+    
+    # Write audit events in batches off the request path
+    audit_writer = asyncio.create_task(audit_batcher.run())
     
     yield
     
     # Shutdown
     print("Shutting down Blockchain Gateway Backend...")
+    sweeper.cancel()
+    partition_maintainer.cancel()
+    audit_writer.cancel()
+    await asyncio.gather(audit_writer, return_exceptions=True)
+    await asyncio.to_thread(audit_batcher.flush)
+    await close_http_client()
 
 
 # Create FastAPI application
@@ -40,12 +67,20 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
 # Mount WebSocket service
 app.mount("/ws", websocket_service.app)
 
+# Open a request scope for database sessions
+app.add_middleware(DBSessionScopeMiddleware)
+
+# Rate limiting (RATE_LIMITED_PATHS), checked once before routing; added
+# early so 429s still pass through CORS and security headers
+app.add_middleware(RateLimitMiddleware)
+
 # Add Security Headers middleware (FIRST - before other middlewares)
 app.add_middleware(SecurityHeadersMiddleware)
 
@@ -56,7 +91,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Explicit methods instead of ["*"]
     allow_headers=["Content-Type", "Authorization", "X-Requested-With"],  # Explicit headers
-    expose_headers=["X-Process-Time"],
+    expose_headers=[ProcessTimeMiddleware.header_name, RequestIDMiddleware.header_name],
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
@@ -75,13 +110,23 @@ app.add_middleware(
 
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+app.add_middleware(ProcessTimeMiddleware)
+
+# Request ID middleware (outermost, so every response carries the ID)
+app.add_middleware(RequestIDMiddleware)
+
+
+# HTTPException handler - same body as FastAPI's default, serialized with orjson
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=headers
+    )
 
 
 # Global exception handler
@@ -94,12 +139,13 @@ async def global_exception_handler(request: Request, exc: Exception):
     # Log the full error internally for debugging
     import logging
     logger = logging.getLogger(__name__)
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    request_id = getattr(request.state, "request_id", None)
+    logger.error(f"Unhandled exception [request_id={request_id}]: {exc}", exc_info=True)
     
     # In production, don't expose internal error details
     if settings.DEBUG:
         # Development: show detailed error
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -110,13 +156,13 @@ async def global_exception_handler(request: Request, exc: Exception):
         )
     else:
         # Production: hide error details
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
                 "error": "Internal server error",
                 "detail": "An unexpected error occurred. Please contact support if the problem persists.",
-                "request_id": id(request)  # Include request ID for support tracking
+                "request_id": request_id  # Include request ID for support tracking
             }
         )
 
@@ -206,5 +252,9 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=4000,
-        reload=settings.DEBUG
+        loop="uvloop",
+        http="httptools",
+        workers=settings.WEB_CONCURRENCY,
+        # reload is incompatible with multiple workers
+        reload=settings.DEBUG and settings.WEB_CONCURRENCY == 1
     )
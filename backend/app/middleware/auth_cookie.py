@@ -50,19 +50,23 @@ class OAuth2PasswordBearerWithCookie(OAuth2PasswordBearer):
         Raises:
             HTTPException: If no valid token found
         """
+        # Reuse the token if another dependency already extracted it this request
+        cached = getattr(request.state, "auth_token", None)
+        if cached is not None:
+            return cached
+        
         token = None
         auth_source = None
         
         # Method 1: Try Authorization header (for API clients)
         authorization: str = request.headers.get("Authorization")
         if authorization:
-            try:
-                scheme, param = authorization.split(" ", 1)
-                if scheme.lower() == "bearer":
-                    token = param
-                    auth_source = "header"
-                    logger.debug(f"Token extracted from Authorization header")
-            except ValueError:
+            # Slice off the scheme instead of split() to avoid the list allocation
+            if authorization[:7].lower() == "bearer ":
+                token = authorization[7:]
+                auth_source = "header"
+                logger.debug("Token extracted from Authorization header")
+            elif " " not in authorization:
                 logger.warning(f"Malformed Authorization header from {request.client.host}")
         
         # Method 2: Try HttpOnly cookie (for web browsers)
@@ -70,7 +74,7 @@ class OAuth2PasswordBearerWithCookie(OAuth2PasswordBearer):
             token = request.cookies.get(self.cookie_name)
             if token:
                 auth_source = "cookie"
-                logger.debug(f"Token extracted from cookie")
+                logger.debug("Token extracted from cookie")
         
         # No token found
         if not token:
@@ -83,6 +87,7 @@ class OAuth2PasswordBearerWithCookie(OAuth2PasswordBearer):
         
         # Store auth source in request state for logging
         request.state.auth_source = auth_source
+        request.state.auth_token = token
         
         return token
 
@@ -11,12 +11,30 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timezone
+import time
 
 from app.database import get_db
 from app.models.user import User
 from app.middleware.rbac import get_current_user
 
 
+# Static parts of the 403 details; per-user fields are merged in at raise time
+_CERTIFICATE_REQUIRED_DETAIL = {
+    "error": "CERTIFICATE_REQUIRED",
+    "message": "You need to enroll with Fabric CA before performing blockchain operations",
+    "action_required": "Please complete enrollment process"
+}
+_ENROLLMENT_INCOMPLETE_DETAIL = {
+    "error": "ENROLLMENT_INCOMPLETE",
+    "action_required": "Please complete or retry enrollment"
+}
+_CERTIFICATE_EXPIRED_DETAIL = {
+    "error": "CERTIFICATE_EXPIRED",
+    "message": "Your Fabric certificate has expired",
+    "action_required": "Please re-enroll with Fabric CA"
+}
+
+
 def require_blockchain_certificate(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -44,36 +62,32 @@ def require_blockchain_certificate(
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={
-                "error": "CERTIFICATE_REQUIRED",
-                "message": "You need to enroll with Fabric CA before performing blockchain operations",
-                "enrollment_status": current_user.fabric_enrollment_status or "not_enrolled",
-                "action_required": "Please complete enrollment process"
+                **_CERTIFICATE_REQUIRED_DETAIL,
+                "enrollment_status": current_user.fabric_enrollment_status or "not_enrolled"
             }
         )
     
-    # Check if certificate is expired
-    if current_user.fabric_cert_expires_at:
-        # Use timezone-aware datetime for comparison
-        now = datetime.now(timezone.utc)
-        if current_user.fabric_cert_expires_at < now:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail={
-                    "error": "CERTIFICATE_EXPIRED",
-                    "message": "Your Fabric certificate has expired",
-                    "expired_at": current_user.fabric_cert_expires_at.isoformat(),
-                    "action_required": "Please re-enroll with Fabric CA"
-                }
-            )
-    
     # Check enrollment status
-    if current_user.fabric_enrollment_status != "enrolled":
+    enrollment_status = current_user.fabric_enrollment_status
+    if enrollment_status != "enrolled":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                **_ENROLLMENT_INCOMPLETE_DETAIL,
+                "message": f"Enrollment status: {enrollment_status}"
+            }
+        )
+    
+    # Check if certificate is expired (expiry cached as a POSIX timestamp on the instance)
+    expiry_ts = getattr(current_user, "_fabric_expiry_ts", None)
+    if expiry_ts is None and current_user.fabric_cert_expires_at:
+        expiry_ts = current_user._fabric_expiry_ts = current_user.fabric_cert_expires_at.timestamp()
+    if expiry_ts is not None and expiry_ts < time.time():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={
-                "error": "ENROLLMENT_INCOMPLETE",
-                "message": f"Enrollment status: {current_user.fabric_enrollment_status}",
-                "action_required": "Please complete or retry enrollment"
+                **_CERTIFICATE_EXPIRED_DETAIL,
+                "expired_at": current_user.fabric_cert_expires_at.isoformat()
             }
         )
     
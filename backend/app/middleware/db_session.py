@@ -0,0 +1,28 @@
+"""
+Database Session Scope Middleware
+
+Opens a request scope for app.database.ScopedSession so that every
+dependency resolved for one HTTP request shares a single Session, and the
+session is released when the request finishes.
+
+Implemented as a pure ASGI middleware (no BaseHTTPMiddleware task group).
+"""
+from app.database import request_scope
+
+
+class DBSessionScopeMiddleware:
+    """Sets a unique session scope key for each HTTP request"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = request_scope.set(object())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
@@ -7,6 +7,7 @@ Features:
 - Automatic lockout on abuse
 - Sliding window algorithm
 - Memory-efficient cleanup
+- Shared state across workers via Redis (falls back to in-process state)
 
 Protection against:
 - Brute force attacks
@@ -15,43 +16,101 @@ Protection against:
 - Credential stuffing
 """
 from fastapi import Request, HTTPException, status
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Optional, Tuple
 import asyncio
 import logging
-from collections import defaultdict
+import secrets
+import time
+from collections import deque
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+
+
+def _lockout_error(remaining_minutes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Too many failed attempts. Account locked for {remaining_minutes} more minutes."
+    )
+
+
+def _limit_exceeded_error(max_requests: int, lockout_duration_minutes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Rate limit exceeded. Too many requests. Locked out for {lockout_duration_minutes} minutes.",
+        headers={
+            "Retry-After": str(lockout_duration_minutes * 60),
+            "X-RateLimit-Limit": str(max_requests),
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + lockout_duration_minutes * 60)
+        }
+    )
+
 
 class RateLimiter:
     def __init__(self):
-        # Store: {ip: {endpoint: [timestamp1, timestamp2, ...]}}
-        self.requests: Dict[str, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
-        # Store: {ip: {endpoint: lockout_until}}
-        self.lockouts: Dict[str, Dict[str, datetime]] = defaultdict(dict)
+        # Timestamps are time.monotonic_ns() values
+        # Store: {(ip, endpoint): deque([timestamp1, timestamp2, ...])}, oldest first
+        self.requests: Dict[Tuple[str, str], deque] = {}
+        # Store: {(ip, endpoint): lockout_until}
+        self.lockouts: Dict[Tuple[str, str], int] = {}
+        # Longest window seen so far; anything older can be swept
+        self._max_window_ns = 0
         
     def _cleanup_old_requests(self, ip: str, endpoint: str, window: int):
         """Remove requests older than the time window"""
-        cutoff = datetime.now() - timedelta(seconds=window)
-        if ip in self.requests and endpoint in self.requests[ip]:
-            self.requests[ip][endpoint] = [
-                ts for ts in self.requests[ip][endpoint] if ts > cutoff
-            ]
+        cutoff = time.monotonic_ns() - window * NS_PER_SECOND
+        timestamps = self.requests.get((ip, endpoint))
+        if timestamps:
+            self._evict_expired(timestamps, cutoff)
+
+    @staticmethod
+    def _evict_expired(timestamps: deque, cutoff: int):
+        """Pop expired timestamps off the left of an ordered deque"""
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
     
     def _is_locked_out(self, ip: str, endpoint: str) -> bool:
         """Check if IP is currently locked out"""
-        if ip in self.lockouts and endpoint in self.lockouts[ip]:
-            if datetime.now() < self.lockouts[ip][endpoint]:
-                return True
-            else:
-                # Lockout expired, remove it
-                del self.lockouts[ip][endpoint]
-        return False
+        return self._lockout_deadline(ip, endpoint, time.monotonic_ns()) is not None
+    
+    def _lockout_deadline(self, ip: str, endpoint: str, now: int) -> Optional[int]:
+        """Return the active lockout deadline, dropping it if expired"""
+        key = (ip, endpoint)
+        deadline = self.lockouts.get(key)
+        if deadline is None:
+            return None
+        if now < deadline:
+            return deadline
+        # Lockout expired, remove it
+        del self.lockouts[key]
+        return None
     
     def _lockout_ip(self, ip: str, endpoint: str, duration_minutes: int):
         """Lock out an IP for specified duration"""
-        self.lockouts[ip][endpoint] = datetime.now() + timedelta(minutes=duration_minutes)
+        self.lockouts[(ip, endpoint)] = time.monotonic_ns() + duration_minutes * NS_PER_MINUTE
+    
+    def sweep(self):
+        """Drop expired timestamps, empty buckets and expired lockouts"""
+        now = time.monotonic_ns()
+        cutoff = now - self._max_window_ns
+        # Newest timestamp is on the right, so an expired one means the whole bucket is idle
+        for key in [k for k, timestamps in self.requests.items() if not timestamps or timestamps[-1] <= cutoff]:
+            del self.requests[key]
+        for key in [k for k, deadline in self.lockouts.items() if deadline <= now]:
+            del self.lockouts[key]
+    
+    async def run_sweeper(self, interval: int = 60):
+        """Periodically sweep state so idle clients don't accumulate in memory"""
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
     
     def get_client_identifier(self, request: Request) -> str:
         """
@@ -65,8 +124,9 @@ class RateLimiter:
         # Check proxy headers
         forwarded = request.headers.get("X-Forwarded-For")
         if forwarded:
-            # Take first IP in chain
-            return forwarded.split(",")[0].strip()
+            # Take first IP in chain (find + slice, no list allocation)
+            comma = forwarded.find(",")
+            return (forwarded if comma == -1 else forwarded[:comma]).strip()
         
         real_ip = request.headers.get("X-Real-IP")
         if real_ip:
@@ -99,67 +159,192 @@ class RateLimiter:
         client_ip = self.get_client_identifier(request)
         endpoint = request.url.path
         
-        logger.debug(f"Rate limit check: {client_ip} -> {endpoint}")
+        logger.debug("Rate limit check: %s -> %s", client_ip, endpoint)
         
-        # Check if IP is locked out
-        if self._is_locked_out(client_ip, endpoint):
-            lockout_until = self.lockouts[client_ip][endpoint]
-            remaining = int((lockout_until - datetime.now()).total_seconds() / 60)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Too many failed attempts. Account locked for {remaining} more minutes."
-            )
+        now = time.monotonic_ns()
+        
+        key = (client_ip, endpoint)
         
-        # Clean up old requests
-        self._cleanup_old_requests(client_ip, endpoint, window_seconds)
+        # Check if IP is locked out
+        lockout_until = self._lockout_deadline(client_ip, endpoint, now)
+        if lockout_until is not None:
+            raise _lockout_error((lockout_until - now) // NS_PER_MINUTE)
         
-        # Add current request
-        self.requests[client_ip][endpoint].append(datetime.now())
+        # Slide the window: drop expired timestamps, then record this request
+        window_ns = window_seconds * NS_PER_SECOND
+        if window_ns > self._max_window_ns:
+            self._max_window_ns = window_ns
+        timestamps = self.requests.get(key)
+        if timestamps is None:
+            timestamps = self.requests[key] = deque()
+        self._evict_expired(timestamps, now - window_ns)
+        timestamps.append(now)
         
         # Check if limit exceeded
-        request_count = len(self.requests[client_ip][endpoint])
+        request_count = len(timestamps)
         if request_count > max_requests:
             # Lock out the IP
-            self._lockout_ip(client_ip, endpoint, lockout_duration_minutes)
+            self.lockouts[key] = now + lockout_duration_minutes * NS_PER_MINUTE
             logger.warning(
                 f"Rate limit exceeded: {client_ip} -> {endpoint} "
                 f"({request_count} requests in {window_seconds}s). "
                 f"Locked out for {lockout_duration_minutes} minutes."
             )
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Too many requests. Locked out for {lockout_duration_minutes} minutes.",
-                headers={
-                    "Retry-After": str(lockout_duration_minutes * 60),
-                    "X-RateLimit-Limit": str(max_requests),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int((datetime.now() + timedelta(minutes=lockout_duration_minutes)).timestamp()))
-                }
-            )
+            raise _limit_exceeded_error(max_requests, lockout_duration_minutes)
         
         # Add rate limit info to response headers (for debugging)
         remaining = max_requests - request_count
-        logger.debug(f"Rate limit OK: {client_ip} -> {endpoint} ({request_count}/{max_requests} requests)")
+        logger.debug("Rate limit OK: %s -> %s (%d/%d requests)", client_ip, endpoint, request_count, max_requests)
         
         return True
 
+
+# KEYS[1] = request ZSET, KEYS[2] = lockout flag
+# ARGV = now_ms, window_ms, max_requests, lockout_ms, member
+# Returns {-1, lockout_pttl} when locked out, else {request_count, 0}
+SLIDING_WINDOW_SCRIPT = """
+local lockout_ttl = redis.call('PTTL', KEYS[2])
+if lockout_ttl > 0 then
+    return {-1, lockout_ttl}
+end
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+redis.call('ZADD', KEYS[1], now, ARGV[5])
+redis.call('PEXPIRE', KEYS[1], window)
+local count = redis.call('ZCARD', KEYS[1])
+if count > tonumber(ARGV[3]) then
+    redis.call('SET', KEYS[2], 1, 'PX', ARGV[4])
+end
+return {count, 0}
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Sliding-window rate limiter shared by all workers through Redis
+    
+    Each (ip, endpoint) pair is a ZSET of request timestamps; one Lua script
+    checks the lockout, slides the window and records the request atomically.
+    While Redis is unreachable the in-process limiter is used instead.
+    """
+    
+    KEY_PREFIX = "ratelimit:"
+    RETRY_AFTER_FAILURE_SECONDS = 30
+    
+    def __init__(self, redis_url: str):
+        super().__init__()
+        self.redis_url = redis_url
+        self._script = None
+        self._retry_at = 0
+    
+    def _get_script(self):
+        if self._script is None:
+            client = aioredis.from_url(self.redis_url, socket_connect_timeout=1, socket_timeout=1)
+            self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        return self._script
+    
+    async def check_rate_limit(
+        self,
+        request: Request,
+        max_requests: int = 5,
+        window_seconds: int = 60,
+        lockout_duration_minutes: int = 15
+    ):
+        """Check the shared Redis window, falling back to in-process state"""
+        if time.monotonic() < self._retry_at:
+            return await super().check_rate_limit(
+                request, max_requests, window_seconds, lockout_duration_minutes
+            )
+        
+        client_ip = self.get_client_identifier(request)
+        endpoint = request.url.path
+        key = f"{self.KEY_PREFIX}{client_ip}:{endpoint}"
+        now_ms = time.time_ns() // 1_000_000
+        
+        try:
+            request_count, lockout_ms = await self._get_script()(
+                keys=[key, key + ":lockout"],
+                args=[
+                    now_ms,
+                    window_seconds * 1000,
+                    max_requests,
+                    lockout_duration_minutes * 60 * 1000,
+                    f"{now_ms}-{secrets.token_hex(4)}",
+                ],
+            )
+        except RedisError as e:
+            logger.warning(f"Redis rate limiting unavailable, using in-process limits: {e}")
+            self._retry_at = time.monotonic() + self.RETRY_AFTER_FAILURE_SECONDS
+            return await super().check_rate_limit(
+                request, max_requests, window_seconds, lockout_duration_minutes
+            )
+        
+        if request_count < 0:
+            raise _lockout_error(lockout_ms // 60_000)
+        
+        if request_count > max_requests:
+            logger.warning(
+                f"Rate limit exceeded: {client_ip} -> {endpoint} "
+                f"({request_count} requests in {window_seconds}s). "
+                f"Locked out for {lockout_duration_minutes} minutes."
+            )
+            raise _limit_exceeded_error(max_requests, lockout_duration_minutes)
+        
+        return True
+
+
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+rate_limiter = RedisRateLimiter(settings.REDIS_URL) if settings.RATE_LIMIT_REDIS else RateLimiter()
+
+# (max_requests, window_seconds, lockout_duration_minutes)
+LOGIN_LIMITS = (5, 300, 15)  # 5 attempts in 5 minutes, lock for 15 minutes
+API_LIMITS = (100, 60, 5)  # 100 requests per minute, lock for 5 minutes
+
+# Paths rate limited by RateLimitMiddleware
+RATE_LIMITED_PATHS = {
+    f"{settings.API_V1_STR}/auth/login": LOGIN_LIMITS,
+}
+
+
+class RateLimitMiddleware:
+    """
+    Applies RATE_LIMITED_PATHS once per request at the ASGI layer
+    
+    Unmatched paths cost a single dict lookup; matched paths that exceed
+    their limit get a 429 response without reaching the router.
+    """
+    
+    def __init__(self, app, limiter: RateLimiter = None, paths: dict = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        self.paths = RATE_LIMITED_PATHS if paths is None else paths
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        limits = self.paths.get(scope["path"])
+        if limits is not None:
+            try:
+                await self.limiter.check_rate_limit(Request(scope), *limits)
+            except HTTPException as e:
+                response = ORJSONResponse(
+                    status_code=e.status_code,
+                    content={"detail": e.detail},
+                    headers=e.headers
+                )
+                await response(scope, receive, send)
+                return
+        
+        await self.app(scope, receive, send)
+
 
 async def login_rate_limit(request: Request):
     """Rate limiter specifically for login endpoint"""
-    await rate_limiter.check_rate_limit(
-        request,
-        max_requests=5,  # 5 attempts
-        window_seconds=300,  # in 5 minutes
-        lockout_duration_minutes=15  # lock for 15 minutes
-    )
+    await rate_limiter.check_rate_limit(request, *LOGIN_LIMITS)
 
 async def api_rate_limit(request: Request):
     """General API rate limiter"""
-    await rate_limiter.check_rate_limit(
-        request,
-        max_requests=100,  # 100 requests
-        window_seconds=60,  # per minute
-        lockout_duration_minutes=5  # lock for 5 minutes
-    )
+    await rate_limiter.check_rate_limit(request, *API_LIMITS)
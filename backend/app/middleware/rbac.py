@@ -1,7 +1,8 @@
 """
 Backend Phase 3 - RBAC Middleware
 """
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable
 from fastapi import HTTPException, status, Depends
 from sqlalchemy.orm import Session
 from app.database import get_db
@@ -10,10 +11,17 @@ from app.services.auth_service import AuthService
 from app.middleware.auth import oauth2_scheme
 
 
+@dataclass(frozen=True, slots=True)
+class Role:
+    """Static role definition"""
+    permissions: FrozenSet[str]
+    description: str
+
+
 # Role definitions with permissions
-ROLES = {
-    "ADMIN": {
-        "permissions": [
+ROLES: Dict[str, Role] = {
+    "ADMIN": Role(
+        permissions=frozenset({
             "chaincode.upload",
             "chaincode.deploy", 
             "chaincode.approve",
@@ -24,60 +32,49 @@ ROLES = {
             "user.view",
             "system.configure",
             "audit.view"
-        ],
-        "description": "Full system access"
-    },
-    "ORG_ADMIN": {
-        "permissions": [
+        }),
+        description="Full system access"
+    ),
+    "ORG_ADMIN": Role(
+        permissions=frozenset({
             "chaincode.upload",
             "chaincode.deploy",
             "chaincode.invoke", 
             "chaincode.query",
             "user.view"
-        ],
-        "description": "Organization administrator"
-    },
-    "USER": {
-        "permissions": [
+        }),
+        description="Organization administrator"
+    ),
+    "USER": Role(
+        permissions=frozenset({
             "chaincode.invoke",
             "chaincode.query",
             "asset.manage"
-        ],
-        "description": "Regular user"
-    },
-    "VIEWER": {
-        "permissions": [
+        }),
+        description="Regular user"
+    ),
+    "VIEWER": Role(
+        permissions=frozenset({
             "chaincode.query",
             "asset.view"
-        ],
-        "description": "Read-only access"
-    }
+        }),
+        description="Read-only access"
+    )
 }
 
 
-def require_role(allowed_roles: List[str]):
-    """Decorator to require specific roles"""
-    def role_checker(current_user: User = Depends(get_current_user)):
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions. Required roles: {allowed_roles}, Current role: {current_user.role}"
-            )
-        return current_user
-    return role_checker
+# Flat role -> permissions map for the permission check (single dict lookup)
+ROLE_PERMISSIONS: Dict[str, FrozenSet[str]] = {
+    name: role.permissions for name, role in ROLES.items()
+}
+_NO_PERMISSIONS = frozenset()
 
 
-def require_permission(permission: str):
-    """Decorator to require specific permission"""
-    def permission_checker(current_user: User = Depends(get_current_user)):
-        user_permissions = ROLES.get(current_user.role, {}).get("permissions", [])
-        if permission not in user_permissions:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Missing required permission: {permission}"
-            )
-        return current_user
-    return permission_checker
+# Role sets for role-based dependencies (O(1) membership, built once)
+ADMIN_ROLES = frozenset({"ADMIN"})
+ORG_ADMIN_ROLES = frozenset({"ADMIN", "ORG_ADMIN"})
+USER_ROLES = frozenset({"ADMIN", "ORG_ADMIN", "USER"})
+VIEWER_ROLES = frozenset({"ADMIN", "ORG_ADMIN", "USER", "VIEWER"})
 
 
 def get_current_user(
@@ -99,11 +96,54 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
     return current_user
 
 
+class _RoleChecker:
+    """Dependency requiring the current user to hold one of the given roles"""
+    __slots__ = ("roles", "_required")
+    
+    def __init__(self, allowed_roles: Iterable[str]):
+        self.roles = frozenset(allowed_roles)
+        self._required = sorted(self.roles)
+    
+    def __call__(self, current_user: User = Depends(get_current_user)):
+        if current_user.role not in self.roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Insufficient permissions. Required roles: {self._required}, Current role: {current_user.role}"
+            )
+        return current_user
+
+
+class _PermissionChecker:
+    """Dependency requiring the current user's role to grant a permission"""
+    __slots__ = ("permission",)
+    
+    def __init__(self, permission: str):
+        self.permission = permission
+    
+    def __call__(self, current_user: User = Depends(get_current_user)):
+        if self.permission not in ROLE_PERMISSIONS.get(current_user.role, _NO_PERMISSIONS):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing required permission: {self.permission}"
+            )
+        return current_user
+
+
+def require_role(allowed_roles: Iterable[str]):
+    """Decorator to require specific roles"""
+    return _RoleChecker(allowed_roles)
+
+
+def require_permission(permission: str):
+    """Decorator to require specific permission"""
+    return _PermissionChecker(permission)
+
+
 # Role-specific dependencies
-require_admin = require_role(["ADMIN"])
-require_org_admin = require_role(["ADMIN", "ORG_ADMIN"])
-require_user = require_role(["ADMIN", "ORG_ADMIN", "USER"])
-require_viewer = require_role(["ADMIN", "ORG_ADMIN", "USER", "VIEWER"])
+require_admin = require_role(ADMIN_ROLES)
+require_org_admin = require_role(ORG_ADMIN_ROLES)
+require_user = require_role(USER_ROLES)
+require_viewer = require_role(VIEWER_ROLES)
 
 # Permission-specific dependencies
 require_chaincode_upload = require_permission("chaincode.upload")
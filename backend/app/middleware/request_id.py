@@ -0,0 +1,36 @@
+"""
+Request ID Middleware
+
+Assigns every HTTP request a random 16-hex-character ID, stored on
+request.state.request_id and echoed back in the X-Request-ID header, so
+logs and error responses can be correlated.
+
+Implemented as a pure ASGI middleware.
+"""
+import secrets
+from starlette.datastructures import MutableHeaders
+
+
+class RequestIDMiddleware:
+    """Generates request.state.request_id and the X-Request-ID header"""
+    
+    header_name = "X-Request-ID"
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # 8 random bytes -> 16 hex chars
+        request_id = secrets.token_hex(8)
+        scope.setdefault("state", {})["request_id"] = request_id
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(self.header_name, request_id)
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,35 @@
+"""
+Request Timing Middleware
+
+Adds X-Process-Time-Ms (integer milliseconds) to every HTTP response.
+
+Implemented as a pure ASGI middleware: it only wraps `send`, so it avoids
+the task group and response re-wrapping of BaseHTTPMiddleware. Uses
+time.monotonic_ns() so the value is immune to wall-clock adjustments.
+"""
+import time
+from starlette.datastructures import MutableHeaders
+
+
+class ProcessTimeMiddleware:
+    """Reports request processing time in the X-Process-Time-Ms header"""
+    
+    header_name = "X-Process-Time-Ms"
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.monotonic_ns()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(self.header_name, str((time.monotonic_ns() - start) // 1_000_000))
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
@@ -8,6 +8,7 @@ from app.models.approval import Approval
 from app.models.audit import AuditLog
 from app.models.channel import Channel
 from app.models.project import Project
+from sqlalchemy.orm import configure_mappers
 
 __all__ = [
     "User",
@@ -19,3 +20,6 @@ __all__ = [
     "Channel",
     "Project"
 ]
+
+# Resolve relationships at import instead of on the first query
+configure_mappers()
@@ -1,21 +1,23 @@
 """
 Backend Phase 3 - Approval Model
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Text, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 from app.database import Base
+from app.utils.uuid7 import uuid7
+
+approval_status_enum = ENUM("pending", "approved", "rejected", name="approval_status")
 
 
 class Approval(Base):
     __tablename__ = "approvals"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     chaincode_id = Column(UUID(as_uuid=True), ForeignKey("chaincodes.id"), nullable=False)
     approver_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    approval_status = Column(String(20), nullable=False, index=True)  # pending, approved, rejected
+    approval_status = Column(approval_status_enum, nullable=False)
     approval_reason = Column(Text)
     approval_date = Column(DateTime(timezone=True), server_default=func.now())
     comments = Column(Text)
@@ -1,29 +1,48 @@
 """
 Backend Phase 3 - Audit Log Model
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID, INET
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, DDL, event
+from sqlalchemy.dialects.postgresql import UUID, INET, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 from app.database import Base
+from app.models.types import InternedString
+from app.utils.uuid7 import uuid7
 
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    action = Column(String(100), nullable=False, index=True)
-    resource_type = Column(String(50), index=True)
+    action = Column(InternedString(100), nullable=False)
+    resource_type = Column(InternedString(50))
     resource_id = Column(String(255), index=True)
-    details = Column(JSON)
+    details = Column(JSONB)
     ip_address = Column(INET)
     user_agent = Column(Text)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Partition key; Postgres requires it in the primary key of a partitioned table
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), index=True)
+    
+    __table_args__ = (
+        # Per-user and per-resource history, newest first
+        Index("ix_audit_user_ts", "user_id", "timestamp"),
+        Index("ix_audit_action_ts", "action", "timestamp"),
+        Index("ix_audit_resource", "resource_type", "resource_id", "timestamp"),
+        # Monthly partitions (audit_logs_YYYY_MM), see ensure_audit_log_partitions()
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
     # Relationships
     user = relationship("User", back_populates="audit_logs")
     
     def __repr__(self):
         return f"<AuditLog(id={self.id}, action={self.action}, user_id={self.user_id})>"
+
+
+# Catch-all for rows outside the pre-created monthly partitions
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT").execute_if(dialect="postgresql"),
+)
@@ -1,35 +1,45 @@
 """
 Backend Phase 3 - Chaincode Model
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
-import uuid
 from app.database import Base
+from app.models.types import InternedString
+from app.utils.uuid7 import uuid7
+
+chaincode_status_enum = ENUM(
+    "uploaded", "validated", "invalid", "approved", "rejected", "deployed", "active", "deprecated",
+    name="chaincode_status",
+)
 
 
 class Chaincode(Base):
     __tablename__ = "chaincodes"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(100), nullable=False, index=True)
     version = Column(String(20), nullable=False, index=True)
-    source_code = Column(Text, nullable=False)
+    source_code = deferred(Column(Text, nullable=False))  # Loaded on first access
     description = Column(Text)
-    language = Column(String(20), default="golang")
-    status = Column(String(20), default="uploaded", index=True)  # uploaded, validated, approved, rejected, deployed, active, deprecated
+    language = Column(InternedString(20), default="golang")
+    status = Column(chaincode_status_enum, default="uploaded")
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     approved_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
     approval_date = Column(DateTime(timezone=True))
     rejection_reason = Column(Text)
-    chaincode_metadata = Column(JSON)
+    chaincode_metadata = Column(JSONB)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # Unique constraint on name and version
-    __table_args__ = (UniqueConstraint('name', 'version', name='_name_version_uc'),)
+    __table_args__ = (
+        # Unique constraint on name and version
+        UniqueConstraint('name', 'version', name='_name_version_uc'),
+        # List endpoint: filter by status, newest first
+        Index("ix_chaincodes_status_created_at", "status", "created_at"),
+    )
     
     # Relationships
     uploader = relationship("User", back_populates="uploaded_chaincodes", foreign_keys=[uploaded_by])
@@ -46,11 +56,11 @@ class Chaincode(Base):
 class ChaincodeVersion(Base):
     __tablename__ = "chaincode_versions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     chaincode_id = Column(UUID(as_uuid=True), ForeignKey("chaincodes.id"), nullable=False)
     version = Column(String(20), nullable=False)
-    source_code = Column(Text, nullable=False)
-    status = Column(String(20), default="active")
+    source_code = deferred(Column(Text, nullable=False))  # Loaded on first access
+    status = Column(InternedString(20), default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Unique constraint on chaincode_id and version
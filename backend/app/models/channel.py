@@ -1,25 +1,28 @@
 """
 Backend Phase 3 - Channel Model
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
-import uuid
 from app.database import Base
+from app.utils.uuid7 import uuid7
+
+channel_status_enum = ENUM("pending", "active", "inactive", "deleted", name="channel_status")
 
 
 class Channel(Base):
     __tablename__ = "channels"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text)
-    config_tx = Column(Text)  # Channel configuration transaction
-    genesis_block = Column(Text)  # Genesis block data
-    status = Column(String(20), default="pending", index=True)  # pending, active, inactive, deleted
+    # Large blobs, loaded together on first access
+    config_tx = deferred(Column(Text), group="blobs")  # Channel configuration transaction
+    genesis_block = deferred(Column(Text), group="blobs")  # Genesis block data
+    status = Column(channel_status_enum, default="pending")
     creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    organizations = Column(JSON)  # List of organizations in the channel
+    organizations = Column(JSONB)  # List of organizations in the channel
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -27,5 +30,10 @@ class Channel(Base):
     creator = relationship("User", back_populates="created_channels")
     deployments = relationship("Deployment", back_populates="channel")
     
+    __table_args__ = (
+        # Stats count active/pending channels; deleted/inactive rows stay out of the index
+        Index("ix_channels_status_open", "status", postgresql_where=text("status IN ('pending', 'active')")),
+    )
+    
     def __repr__(self):
         return f"<Channel(id={self.id}, name={self.name}, status={self.status})>"
@@ -1,33 +1,40 @@
 """
 Backend Phase 3 - Deployment Model
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
-import uuid
 from app.database import Base
+from app.utils.uuid7 import uuid7
+
+deployment_status_enum = ENUM("pending", "deploying", "success", "failed", "rolled_back", name="deployment_status")
 
 
 class Deployment(Base):
     __tablename__ = "deployments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     chaincode_id = Column(UUID(as_uuid=True), ForeignKey("chaincodes.id"), nullable=False)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
     channel_id = Column(UUID(as_uuid=True), ForeignKey("channels.id"))
     channel_name = Column(String(100), nullable=False, index=True)
-    target_peers = Column(JSON, nullable=False)  # List of peer endpoints
-    deployment_status = Column(String(20), default="pending", index=True)  # pending, deploying, success, failed, rolled_back
+    target_peers = Column(JSONB, nullable=False)  # List of peer endpoints
+    deployment_status = Column(deployment_status_enum, default="pending")
     deployed_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     deployment_date = Column(DateTime(timezone=True))
     completion_date = Column(DateTime(timezone=True))
     error_message = Column(Text)
-    deployment_logs = Column(Text)
-    deployment_metadata = Column(JSON)
+    deployment_logs = deferred(Column(Text))  # Loaded on first access
+    deployment_metadata = Column(JSONB)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # List endpoint: filter by status, newest first
+        Index("ix_deployments_status_created_at", "deployment_status", "created_at"),
+    )
+    
     # Relationships
     chaincode = relationship("Chaincode", back_populates="deployments")
     project = relationship("Project", back_populates="deployments")
@@ -1,25 +1,28 @@
 """
 Backend Phase 3 - Project Model
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 from app.database import Base
+from app.models.types import InternedString
+from app.utils.uuid7 import uuid7
+
+project_status_enum = ENUM("active", "inactive", "archived", "deleted", name="project_status")
 
 
 class Project(Base):
     __tablename__ = "projects"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text)
-    project_type = Column(String(50), default="blockchain", index=True)  # blockchain, web3, defi, etc.
-    status = Column(String(20), default="active", index=True)  # active, inactive, archived, deleted
+    project_type = Column(InternedString(50), default="blockchain", index=True)  # blockchain, web3, defi, etc.
+    status = Column(project_status_enum, default="active")
     creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    team_members = Column(JSON)  # List of user IDs
-    settings = Column(JSON)  # Project-specific settings
+    team_members = Column(JSONB)  # List of user IDs
+    settings = Column(JSONB)  # Project-specific settings
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -28,5 +31,12 @@ class Project(Base):
     chaincodes = relationship("Chaincode", back_populates="project")
     deployments = relationship("Deployment", back_populates="project")
     
+    __table_args__ = (
+        # Membership filters use JSONB containment (@>)
+        Index("ix_project_members_gin", "team_members", postgresql_using="gin"),
+        # Stats count active/inactive projects; archived/deleted rows stay out of the index
+        Index("ix_projects_status_live", "status", postgresql_where=text("status IN ('active', 'inactive')")),
+    )
+    
     def __repr__(self):
         return f"<Project(id={self.id}, name={self.name}, status={self.status})>"
@@ -0,0 +1,21 @@
+"""
+Backend Phase 3 - Custom Column Types
+"""
+import sys
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+
+class InternedString(TypeDecorator):
+    """String column whose loaded values are interned.
+    
+    For low-cardinality columns (language, msp_id, audit action...) every
+    row then shares one str object per distinct value instead of a fresh
+    copy from the driver. Native ENUM columns already get this from
+    SQLAlchemy's Enum lookup and do not need it.
+    """
+    impl = String
+    cache_ok = True
+    
+    def process_result_value(self, value, dialect):
+        return sys.intern(value) if value else value
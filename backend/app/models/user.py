@@ -2,37 +2,47 @@
 Backend Phase 3 - User Model
 """
 from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, ENUM
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
-import uuid
 from app.database import Base
+from app.models.types import InternedString
+from app.utils.uuid7 import uuid7
+
+user_role_enum = ENUM("ADMIN", "ORG_ADMIN", "USER", "VIEWER", name="user_role")
+user_status_enum = ENUM(
+    "active", "inactive", "suspended", "pending", "enrollment_failed", "enrollment_error",
+    "revoked", "certificate_revoked",
+    name="user_status",
+)
+fabric_enrollment_status_enum = ENUM("pending", "enrolled", "failed", "revoked", name="fabric_enrollment_status")
 
 
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(100), unique=True, nullable=False, index=True)
     password_hash = Column(String(255))
-    role = Column(String(20), nullable=False, index=True)  # ADMIN, ORG_ADMIN, USER, VIEWER
-    msp_id = Column(String(50), index=True)
+    role = Column(user_role_enum, nullable=False, index=True)
+    msp_id = Column(InternedString(50), index=True)
     certificate_id = Column(String(255), index=True)
-    certificate_pem = Column(Text)  # Public certificate in PEM format
-    private_key_pem = Column(Text)  # Private key in PEM format (encrypted)
-    public_key_pem = Column(Text)   # Public key in PEM format
-    organization = Column(String(100))
+    # PEM blobs are only read by identity/certificate endpoints; load them on demand
+    certificate_pem = deferred(Column(Text), group="pem")  # Public certificate in PEM format
+    private_key_pem = deferred(Column(Text), group="pem")  # Private key in PEM format (encrypted)
+    public_key_pem = deferred(Column(Text), group="pem")   # Public key in PEM format
+    organization = Column(InternedString(100))
     
     # Fabric CA Enrollment
     fabric_enrollment_id = Column(String(255), unique=True, index=True)  # CA enrollment ID
     fabric_enrollment_secret = Column(String(255))  # Initial enrollment secret (hashed)
-    fabric_ca_name = Column(String(100), default="ca-org1")  # Which CA issued the cert
+    fabric_ca_name = Column(InternedString(100), default="ca-org1")  # Which CA issued the cert
     fabric_cert_serial = Column(String(255))  # Certificate serial number
     fabric_cert_issued_at = Column(DateTime(timezone=True))  # When cert was issued
     fabric_cert_expires_at = Column(DateTime(timezone=True))  # When cert expires
-    fabric_enrollment_status = Column(String(20), default="pending")  # pending, enrolled, failed, revoked
-    status = Column(String(20), default="active", index=True)  # active, inactive, suspended
+    fabric_enrollment_status = Column(fabric_enrollment_status_enum, default="pending")
+    status = Column(user_status_enum, default="active", index=True)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     last_login = Column(DateTime(timezone=True))
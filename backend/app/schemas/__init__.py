@@ -1,7 +1,7 @@
 """
 Backend Phase 3 - Schemas Package
 """
-from app.schemas.user import User, UserCreate, UserUpdate, UserList
+from app.schemas.user import User, UserCreate, UserUpdate, UserList, UserRole, UserStatus
 from app.schemas.chaincode import (
     Chaincode, ChaincodeUpload, ChaincodeDeploy, 
     ChaincodeInvoke, ChaincodeQuery, ChaincodeList
@@ -9,7 +9,7 @@ from app.schemas.chaincode import (
 from app.schemas.auth import Token, LoginRequest, RefreshTokenRequest
 
 __all__ = [
-    "User", "UserCreate", "UserUpdate", "UserList",
+    "User", "UserCreate", "UserUpdate", "UserList", "UserRole", "UserStatus",
     "Chaincode", "ChaincodeUpload", "ChaincodeDeploy",
     "ChaincodeInvoke", "ChaincodeQuery", "ChaincodeList",
     "Token", "LoginRequest", "RefreshTokenRequest"
@@ -1,24 +1,19 @@
 """
 Backend Phase 3 - Chaincode Schemas
 """
-from pydantic import BaseModel, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, TypeAdapter, validator
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from uuid import UUID
 
+Language = Literal["golang", "java", "javascript", "typescript"]
+
 
 class ChaincodeBase(BaseModel):
     name: str
     version: str
     description: Optional[str] = None
-    language: str = "golang"
-    
-    @validator('language')
-    def validate_language(cls, v):
-        allowed_languages = ['golang', 'java', 'javascript', 'typescript']
-        if v not in allowed_languages:
-            raise ValueError(f'Language must be one of: {allowed_languages}')
-        return v
+    language: Language = "golang"
 
 
 class ChaincodeUpload(ChaincodeBase):
@@ -34,14 +29,8 @@ class ChaincodeUpload(ChaincodeBase):
 class ChaincodeDeploy(BaseModel):
     chaincode_id: UUID
     channel_name: str
-    target_peers: List[str]
+    target_peers: List[str] = Field(..., min_length=1, description="Target peers (at least one)")
     sequence: Optional[int] = 1
-    
-    @validator('target_peers')
-    def validate_target_peers(cls, v):
-        if not v:
-            raise ValueError('Target peers cannot be empty')
-        return v
 
 
 class ChaincodeInvoke(BaseModel):
@@ -83,6 +72,10 @@ class Chaincode(ChaincodeInDB):
     pass
 
 
+# Compiled once; converts a page of ORM rows in a single validation pass
+CHAINCODES_ADAPTER = TypeAdapter(List[Chaincode])
+
+
 class ChaincodeList(BaseModel):
     chaincodes: List[Chaincode]
     total: int
@@ -1,8 +1,8 @@
 """
 Backend Phase 3 - Channel Schemas
 """
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from uuid import UUID
 
@@ -20,7 +20,7 @@ class ChannelCreate(ChannelBase):
 
 class ChannelUpdate(BaseModel):
     description: Optional[str] = Field(None, description="Channel description")
-    status: Optional[str] = Field(None, description="Channel status")
+    status: Optional[Literal["pending", "active", "inactive", "deleted"]] = Field(None, description="Channel status")
     organizations: Optional[List[str]] = Field(None, description="List of organizations")
 
 
@@ -37,6 +37,10 @@ class ChannelResponse(ChannelBase):
         from_attributes = True
 
 
+# Compiled once; converts a page of ORM rows in a single validation pass
+CHANNELS_ADAPTER = TypeAdapter(List[ChannelResponse])
+
+
 class ChannelList(BaseModel):
     channels: List[ChannelResponse]
     total: int
@@ -1,8 +1,8 @@
 """
 Backend Phase 3 - Project Schemas
 """
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Dict, Any
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from uuid import UUID
 
@@ -21,7 +21,7 @@ class ProjectCreate(ProjectBase):
 
 class ProjectUpdate(BaseModel):
     description: Optional[str] = Field(None, description="Project description")
-    status: Optional[str] = Field(None, description="Project status")
+    status: Optional[Literal["active", "inactive", "archived", "deleted"]] = Field(None, description="Project status")
     team_members: Optional[List[str]] = Field(None, description="List of team member user IDs")
     settings: Optional[Dict[str, Any]] = Field(None, description="Project-specific settings")
 
@@ -37,6 +37,10 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
+# Compiled once; converts a page of ORM rows in a single validation pass
+PROJECTS_ADAPTER = TypeAdapter(List[ProjectResponse])
+
+
 class ProjectList(BaseModel):
     projects: List[ProjectResponse]
     total: int
@@ -1,52 +1,48 @@
 """
 Backend Phase 3 - User Schemas
 """
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
+from typing import Optional, List, Literal
 from datetime import datetime
+from enum import Enum
 from uuid import UUID
 
+from app.models.user import user_status_enum
+
+
+class UserRole(str, Enum):
+    ADMIN = "ADMIN"
+    ORG_ADMIN = "ORG_ADMIN"
+    USER = "USER"
+    VIEWER = "VIEWER"
+
+
+# Built from the user_status DB ENUM so query validation accepts every stored value
+UserStatus = Enum("UserStatus", {value.upper(): value for value in user_status_enum.enums}, type=str)
+
+
+Role = Literal["ADMIN", "ORG_ADMIN", "USER", "VIEWER"]
+
 
 class UserBase(BaseModel):
     username: str
     email: EmailStr
-    role: str
+    role: Role
     msp_id: Optional[str] = None
     organization: Optional[str] = None
-    
-    @validator('role')
-    def validate_role(cls, v):
-        allowed_roles = ['ADMIN', 'ORG_ADMIN', 'USER', 'VIEWER']
-        if v not in allowed_roles:
-            raise ValueError(f'Role must be one of: {allowed_roles}')
-        return v
 
 
 class UserCreate(UserBase):
-    password: str
-    
-    @validator('password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    password: str = Field(..., min_length=8)
 
 
 class UserUpdate(BaseModel):
     username: Optional[str] = None
     email: Optional[EmailStr] = None
-    role: Optional[str] = None
+    role: Optional[Role] = None
     msp_id: Optional[str] = None
     organization: Optional[str] = None
-    status: Optional[str] = None
-    
-    @validator('role')
-    def validate_role(cls, v):
-        if v is not None:
-            allowed_roles = ['ADMIN', 'ORG_ADMIN', 'USER', 'VIEWER']
-            if v not in allowed_roles:
-                raise ValueError(f'Role must be one of: {allowed_roles}')
-        return v
+    status: Optional[UserStatus] = None
 
 
 class UserInDB(UserBase):
@@ -58,14 +54,21 @@ class UserInDB(UserBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class User(UserInDB):
     pass
 
 
+# Compiled once; converts a page of ORM users in a single validation pass
+USERS_ADAPTER = TypeAdapter(List[User])
+
+
+class UserBulkDeactivate(BaseModel):
+    user_ids: List[UUID]
+
+
 class UserList(BaseModel):
     users: List[User]
     total: int
@@ -1,10 +1,132 @@
 """
 Backend Phase 3 - Audit Service
 """
-from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
+import asyncio
+import logging
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List
+from sqlalchemy import lambda_stmt, select, text, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, raiseload
 from uuid import UUID
+from app.database import engine
 from app.models.audit import AuditLog
+from app.utils.uuid7 import uuid7
+
+logger = logging.getLogger(__name__)
+
+# How often the running app re-checks that upcoming audit_logs partitions exist
+PARTITION_CHECK_INTERVAL = 24 * 60 * 60
+
+
+def ensure_audit_log_partitions(bind: Engine, months_ahead: int = 3) -> None:
+    """Create monthly audit_logs partitions for the current month and the next few"""
+    if bind.dialect.name != "postgresql":
+        return
+    
+    month = date.today().replace(day=1)
+    for _ in range(months_ahead + 1):
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        try:
+            with bind.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+                    f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+                ))
+        except SQLAlchemyError as e:
+            # Fails if the default partition already holds rows for this month
+            logger.warning("Could not create audit_logs partition for %s: %s", month, e)
+        month = next_month
+
+
+async def run_partition_maintainer(bind: Engine, interval: float = PARTITION_CHECK_INTERVAL):
+    """Periodically create upcoming audit_logs partitions so rows never land in the default one"""
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(ensure_audit_log_partitions, bind)
+
+
+class AuditBatcher:
+    """
+    Buffers audit rows and writes them in multi-row INSERTs.
+    
+    Services enqueue from request threads; run() drains the buffer every
+    `interval` seconds in batches of up to `max_batch` rows, so a burst of
+    events costs one round trip and one commit instead of one each.
+    """
+    
+    def __init__(self, bind: Engine, max_batch: int = 500, interval: float = 0.05):
+        self.bind = bind
+        self.max_batch = max_batch
+        self.interval = interval
+        self._pending: deque = deque()
+        self.running = False
+    
+    def enqueue(self, row: Dict[str, Any]):
+        self._pending.append(row)
+    
+    def _drain(self) -> List[Dict[str, Any]]:
+        rows = []
+        while self._pending and len(rows) < self.max_batch:
+            rows.append(self._pending.popleft())
+        return rows
+    
+    def _insert(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Write a batch; returns True if rows were put back for a later retry.
+        
+        A batch rejected for its data is retried row by row so only the
+        offending rows are lost. Any other database error (e.g. an outage)
+        requeues the unwritten rows at the front of the buffer.
+        """
+        try:
+            with self.bind.begin() as conn:
+                conn.execute(AuditLog.__table__.insert(), rows)
+            return False
+        except (IntegrityError, DataError):
+            pass
+        except SQLAlchemyError as e:
+            logger.error("Failed to write %d audit log rows, will retry: %s", len(rows), e)
+            self._pending.extendleft(reversed(rows))
+            return True
+        
+        for i, row in enumerate(rows):
+            try:
+                with self.bind.begin() as conn:
+                    conn.execute(AuditLog.__table__.insert(), [row])
+            except (IntegrityError, DataError) as e:
+                logger.error("Dropped audit log row %s (%s): %s", row.get("id"), row.get("action"), e)
+            except SQLAlchemyError as e:
+                logger.error("Failed to write %d audit log rows, will retry: %s", len(rows) - i, e)
+                self._pending.extendleft(reversed(rows[i:]))
+                return True
+        return False
+    
+    def flush(self):
+        """Write everything still buffered (blocking); stops at the first requeued batch"""
+        while self._pending:
+            if self._insert(self._drain()):
+                logger.error("%d audit log rows left unwritten", len(self._pending))
+                return
+    
+    async def run(self):
+        """Background writer; cancel it, then call flush() on shutdown"""
+        self.running = True
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                while self._pending:
+                    # Requeued rows wait for the next interval
+                    if await asyncio.to_thread(self._insert, self._drain()):
+                        break
+        finally:
+            self.running = False
+
+
+# Global audit batcher instance, started by the application lifespan
+audit_batcher = AuditBatcher(engine)
 
 
 class AuditService:
@@ -20,23 +142,56 @@ class AuditService:
         details: Optional[Dict[str, Any]] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
-    ) -> AuditLog:
+    ):
         """Log an audit event"""
-        audit_log = AuditLog(
-            user_id=user_id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent
+        row = self._build_row(
+            user_id, action, resource_type, resource_id, details, ip_address, user_agent
         )
         
-        self.db.add(audit_log)
+        if audit_batcher.running:
+            audit_batcher.enqueue(row)
+            return
+        
+        # No background writer (scripts, tests): write through the session
+        self.db.add(AuditLog(**row))
         self.db.commit()
-        self.db.refresh(audit_log)
+    
+    def log_events(self, events: List[Dict[str, Any]]):
+        """
+        Log several audit events (log_event keyword dicts) without committing.
+        Without a background writer the rows join the caller's transaction.
+        """
+        rows = [self._build_row(**event) for event in events]
+        
+        if audit_batcher.running:
+            for row in rows:
+                audit_batcher.enqueue(row)
+            return
         
-        return audit_log
+        self.db.add_all([AuditLog(**row) for row in rows])
+    
+    @staticmethod
+    def _build_row(
+        user_id: Optional[UUID],
+        action: str,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return {
+            "id": uuid7(),
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            # Event time, not the time the batch is written
+            "timestamp": datetime.now(timezone.utc),
+        }
     
     def get_audit_logs(
         self,
@@ -44,16 +199,40 @@ class AuditService:
         action: Optional[str] = None,
         resource_type: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        before_ts: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
     ):
-        """Get audit logs with filters"""
-        query = self.db.query(AuditLog)
+        """
+        Get audit logs with filters, newest first
+        
+        Pass the (timestamp, id) of the last row of the previous page as
+        before_ts/before_id to page by keyset instead of OFFSET; skip is
+        ignored then.
+        """
+        # Lambda statements cache the compiled SQL per filter combination;
+        # later calls only bind new values
+        # List responses only render columns; fail loudly on lazy relationship loads (N+1)
+        stmt = lambda_stmt(lambda: select(AuditLog).options(raiseload("*")))
         
         if user_id:
-            query = query.filter(AuditLog.user_id == user_id)
+            stmt += lambda s: s.where(AuditLog.user_id == user_id)
         if action:
-            query = query.filter(AuditLog.action == action)
+            stmt += lambda s: s.where(AuditLog.action == action)
         if resource_type:
-            query = query.filter(AuditLog.resource_type == resource_type)
+            stmt += lambda s: s.where(AuditLog.resource_type == resource_type)
+        
+        # id breaks timestamp ties so keyset pages neither skip nor repeat rows
+        stmt += lambda s: s.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+        if before_ts is not None:
+            if before_id is not None:
+                stmt += lambda s: s.where(
+                    tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(before_ts, before_id)
+                )
+            else:
+                stmt += lambda s: s.where(AuditLog.timestamp < before_ts)
+        else:
+            stmt += lambda s: s.offset(skip)
+        stmt += lambda s: s.limit(limit)
         
-        return query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
+        return self.db.execute(stmt).scalars().all()
@@ -22,10 +22,13 @@ This separation allows:
 """
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, select, update
+from sqlalchemy.orm import Session, undefer
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.auth import LoginRequest, Token
+from app.core.user_cache import get_cached_user, cache_user, invalidate_cached_users
+from app.core.token_cache import verification_cache
 from app.utils.security import (
     verify_password, 
     create_access_token, 
@@ -35,13 +38,24 @@ from app.utils.security import (
 from app.config import settings
 
 
+# Columns needed to check credentials and issue tokens
+_CREDENTIAL_COLUMNS = (User.id, User.username, User.role, User.is_active, User.password_hash)
+
+
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
-    def authenticate_user(self, username: str, password: str) -> Optional[User]:
-        """Authenticate user with username and password"""
-        user = self.db.query(User).filter(User.username == username).first()
+    def authenticate_user(self, username: str, password: str) -> Optional[Row]:
+        """
+        Authenticate user with username and password
+        
+        Returns a row of (id, username, role, is_active, password_hash)
+        rather than a full User, which is all login needs.
+        """
+        user = self.db.execute(
+            select(*_CREDENTIAL_COLUMNS).where(User.username == username)
+        ).first()
         if not user:
             return None
         if not verify_password(password, user.password_hash):
@@ -50,8 +64,8 @@ class AuthService:
             return None
         return user
     
-    def create_tokens(self, user: User) -> Token:
-        """Create access and refresh tokens for user"""
+    def create_tokens(self, user) -> Token:
+        """Create access and refresh tokens for a User or credential row"""
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         
@@ -83,7 +97,9 @@ class AuthService:
                     detail="Invalid refresh token"
                 )
             
-            user = self.db.query(User).filter(User.id == user_id).first()
+            user = self.db.execute(
+                select(*_CREDENTIAL_COLUMNS).where(User.id == user_id)
+            ).first()
             if not user or not user.is_active:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,21 +119,33 @@ class AuthService:
     def get_current_user(self, token: str) -> User:
         """Get current user from access token"""
         try:
-            payload = verify_token(token, "access")
-            user_id = payload.get("sub")
+            # Recently verified tokens skip JWT decode/signature checks
+            user_id = verification_cache.get(token)
+            if user_id is None:
+                payload = verify_token(token, "access")
+                user_id = payload.get("sub")
+                
+                if not user_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Could not validate credentials"
+                    )
+                verification_cache.put(token, user_id, payload["exp"])
             
-            if not user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Could not validate credentials"
-                )
-            
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User not found"
-                )
+            # Cached snapshot avoids a SELECT on every protected request
+            user = get_cached_user(user_id)
+            if user is None:
+                # certificate_pem is cached and checked by blockchain auth
+                user = self.db.query(User).options(undefer(User.certificate_pem)).filter(
+                    User.id == user_id
+                ).first()
+                if not user:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="User not found"
+                    )
+                if user.is_active:
+                    cache_user(user)
             
             if not user.is_active:
                 raise HTTPException(
@@ -135,8 +163,10 @@ class AuthService:
                 detail="Could not validate credentials"
             )
     
-    def update_last_login(self, user: User):
+    def update_last_login(self, user):
         """Update user's last login timestamp"""
-        user.last_login = datetime.utcnow()
+        self.db.execute(
+            update(User).where(User.id == user.id).values(last_login=datetime.utcnow())
+        )
         self.db.commit()
-        self.db.refresh(user)
+        invalidate_cached_users([user.id])
@@ -2,16 +2,73 @@
 Blockchain Service - Query blockchain data via Fabric Gateway
 Provides: Channel info, blocks, transactions for Blockchain Explorer
 """
-import httpx
+import asyncio
+import functools
+import hashlib
 import os
 import logging
 import json
 import subprocess
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
+import orjson
+
+from app.core.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
+# Max concurrent block fetches in get_blocks()
+BLOCK_FETCH_CONCURRENCY = 10
+
+# Channel height only moves when a block commits; serve repeat lookups from memory.
+# Channel names come from the client, so the cache is a bounded LRU holding only
+# channels the Gateway answered for, and locks live only while a fetch is in flight.
+CHANNEL_INFO_TTL = 2.0
+CHANNEL_INFO_CACHE_SIZE = 32
+_channel_info_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_channel_info_locks: Dict[str, asyncio.Lock] = {}
+
+
+@functools.lru_cache(maxsize=4096)
+def _block_hash(block_number: int) -> str:
+    """Mock hash for a block; adjacent summaries share block N-1's hash"""
+    if block_number < 0:
+        return "0" * 64
+    return hashlib.sha256(f"block_{block_number}".encode()).hexdigest()
+
+
+# Placeholder for identities hidden from non-admin users
+_REDACTED = "***REDACTED***"
+
+# Mock fallbacks served while the Gateway blockchain APIs are unavailable.
+# Built once and shared; callers must not mutate them.
+_MOCK_CHANNEL_INFO = {
+    "height": 11,  # Known from CLI
+    "currentBlockHash": "/Hb+m5sE7KCl1SVD8EMWOxbhG5qXXIg1VgmfZiDk3Gw=",
+    "previousBlockHash": "Uq645SxQ+GqZPhQJbcMybMCUXZWbVDn7VC2mlGtyAAw="
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _mock_block(block_number: int) -> Dict[str, Any]:
+    return {
+        "number": block_number,
+        "header": {
+            "number": block_number,
+            "data_hash": _block_hash(block_number),
+            "previous_hash": _block_hash(block_number - 1)
+        },
+        "data": {
+            "data": []  # Transactions would go here
+        },
+        "metadata": {
+            "note": "Full block details require Fabric Gateway implementation"
+        }
+    }
+
 
 class BlockchainService:
     """Service to interact with blockchain for explorer features"""
@@ -33,32 +90,53 @@ class BlockchainService:
         Returns:
             Dict with height, currentBlockHash, previousBlockHash
         """
+        cached = _channel_info_cache.get(channel_name)
+        if cached and time.monotonic() - cached[0] < CHANNEL_INFO_TTL:
+            return dict(cached[1])
+        
+        # One in-flight Gateway request per channel; waiters reuse its result
+        lock = _channel_info_locks.setdefault(channel_name, asyncio.Lock())
+        try:
+            async with lock:
+                cached = _channel_info_cache.get(channel_name)
+                if cached and time.monotonic() - cached[0] < CHANNEL_INFO_TTL:
+                    return dict(cached[1])
+                info = await self._fetch_channel_info(channel_name)
+                if info is not _MOCK_CHANNEL_INFO:
+                    _channel_info_cache[channel_name] = (time.monotonic(), info)
+                    _channel_info_cache.move_to_end(channel_name)
+                    if len(_channel_info_cache) > CHANNEL_INFO_CACHE_SIZE:
+                        _channel_info_cache.popitem(last=False)
+                return dict(info)
+        finally:
+            if not lock.locked() and _channel_info_locks.get(channel_name) is lock:
+                del _channel_info_locks[channel_name]
+    
+    async def _fetch_channel_info(self, channel_name: str) -> Dict[str, Any]:
+        """Query channel info from Fabric Gateway (uncached)"""
         try:
             # Try Fabric Gateway API first
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                try:
-                    response = await client.get(
-                        f"{self.fabric_gateway_url}/api/blockchain/channel-info",
-                        params={"channelName": channel_name}
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get("success"):
-                            logger.info(f"Channel info retrieved via Gateway: {channel_name}")
-                            return data["data"]
-                except Exception as e:
-                    logger.warning(f"Fabric Gateway API not available: {e}")
+            client = get_http_client()
+            try:
+                response = await client.get(
+                    f"{self.fabric_gateway_url}/api/blockchain/channel-info",
+                    params={"channelName": channel_name},
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    if data.get("success"):
+                        logger.info(f"Channel info retrieved via Gateway: {channel_name}")
+                        return data["data"]
+            except Exception as e:
+                logger.warning(f"Fabric Gateway API not available: {e}")
             
             # Fallback not available - Fabric Gateway should handle this
             logger.error("Fabric Gateway blockchain APIs not implemented yet")
             
             # Return mock data for now (TODO: Implement in Fabric Gateway)
-            return {
-                "height": 11,  # Known from CLI
-                "currentBlockHash": "/Hb+m5sE7KCl1SVD8EMWOxbhG5qXXIg1VgmfZiDk3Gw=",
-                "previousBlockHash": "Uq645SxQ+GqZPhQJbcMybMCUXZWbVDn7VC2mlGtyAAw="
-            }
+            return _MOCK_CHANNEL_INFO
             
         except Exception as e:
             logger.error(f"Failed to get channel info: {str(e)}", exc_info=True)
@@ -88,25 +166,46 @@ class BlockchainService:
             
             # Calculate pagination
             skip = (page - 1) * limit
+            total_pages = -(-height // limit)  # ceil division
+            if skip >= height:
+                # Past the oldest block: nothing to fetch
+                return {
+                    "blocks": [],
+                    "total": height,
+                    "page": page,
+                    "limit": limit,
+                    "totalPages": total_pages,
+                    "hasMore": False
+                }
             start_block = max(0, height - skip - limit)
-            end_block = min(height, height - skip)
+            end_block = height - skip
+            
+            # Fetch block summaries (lightweight - no full TX data) concurrently
+            semaphore = asyncio.Semaphore(BLOCK_FETCH_CONCURRENCY)
+            
+            async def _fetch(block_num: int) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.get_block_summary(channel_name, block_num)
+            
+            block_numbers = range(end_block - 1, start_block - 1, -1)  # Newest first
+            results = await asyncio.gather(
+                *(_fetch(block_num) for block_num in block_numbers), return_exceptions=True
+            )
             
-            # Fetch block summaries (lightweight - no full TX data)
             blocks = []
-            for block_num in range(end_block - 1, start_block - 1, -1):  # Newest first
-                try:
-                    block_summary = await self.get_block_summary(channel_name, block_num)
-                    blocks.append(block_summary)
-                except Exception as e:
-                    logger.warning(f"Failed to get block {block_num}: {e}")
+            for block_num, result in zip(block_numbers, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to get block {block_num}: {result}")
                     # Continue with other blocks
+                else:
+                    blocks.append(result)
             
             return {
                 "blocks": blocks,
                 "total": height,
                 "page": page,
                 "limit": limit,
-                "totalPages": (height + limit - 1) // limit,
+                "totalPages": total_pages,
                 "hasMore": end_block < height
             }
             
@@ -124,9 +223,8 @@ class BlockchainService:
         try:
             # Return summary structure
             # Real hashes would come from Fabric Gateway (TODO: implement there)
-            import hashlib
-            mock_hash = hashlib.sha256(f"block_{block_number}".encode()).hexdigest()
-            prev_hash = hashlib.sha256(f"block_{block_number-1}".encode()).hexdigest() if block_number > 0 else "0" * 64
+            mock_hash = _block_hash(block_number)
+            prev_hash = _block_hash(block_number - 1)
             
             return {
                 "blockNumber": block_number,  # Frontend expects blockNumber
@@ -154,44 +252,33 @@ class BlockchainService:
         Returns:
             Complete block data including all transactions
         """
+        cached = _channel_info_cache.get(channel_name)
+        if cached and block_number >= cached[1].get("height", 0):
+            # Caller has seen a block past our cached height; it is stale
+            _channel_info_cache.pop(channel_name, None)
+        
         try:
             # Try Fabric Gateway API
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                try:
-                    response = await client.get(
-                        f"{self.fabric_gateway_url}/api/blockchain/block/{block_number}",
-                        params={"channelName": channel_name}
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get("success"):
-                            return data["data"]
-                except Exception as e:
-                    logger.warning(f"Gateway block API not available: {e}")
+            client = get_http_client()
+            try:
+                response = await client.get(
+                    f"{self.fabric_gateway_url}/api/blockchain/block/{block_number}",
+                    params={"channelName": channel_name},
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    if data.get("success"):
+                        return data["data"]
+            except Exception as e:
+                logger.warning(f"Gateway block API not available: {e}")
             
             # Fallback: Return mock structure for now
             # TODO: Implement full block parsing in Fabric Gateway
             logger.info(f"Returning mock block data for {block_number}")
             
-            import hashlib
-            block_hash = hashlib.sha256(f"block_{block_number}".encode()).hexdigest()
-            prev_hash = hashlib.sha256(f"block_{block_number-1}".encode()).hexdigest() if block_number > 0 else "0" * 64
-            
-            return {
-                "number": block_number,
-                "header": {
-                    "number": block_number,
-                    "data_hash": block_hash,
-                    "previous_hash": prev_hash
-                },
-                "data": {
-                    "data": []  # Transactions would go here
-                },
-                "metadata": {
-                    "note": "Full block details require Fabric Gateway implementation"
-                }
-            }
+            return _mock_block(block_number)
             
         except Exception as e:
             logger.error(f"Failed to get block details {block_number}: {e}")
@@ -214,20 +301,21 @@ class BlockchainService:
         """
         try:
             # Try Fabric Gateway API
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                try:
-                    response = await client.get(
-                        f"{self.fabric_gateway_url}/api/blockchain/transaction/{tx_id}",
-                        params={"channelName": channel_name}
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get("success"):
-                            logger.info(f"Transaction retrieved: {tx_id[:20]}...")
-                            return data["data"]
-                except Exception as e:
-                    logger.warning(f"Gateway transaction API not available: {e}")
+            client = get_http_client()
+            try:
+                response = await client.get(
+                    f"{self.fabric_gateway_url}/api/blockchain/transaction/{tx_id}",
+                    params={"channelName": channel_name},
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    if data.get("success"):
+                        logger.info(f"Transaction retrieved: {tx_id[:20]}...")
+                        return data["data"]
+            except Exception as e:
+                logger.warning(f"Gateway transaction API not available: {e}")
             
             # Return basic structure
             # TODO: Implement in Fabric Gateway to query transaction by ID
@@ -254,15 +342,18 @@ class BlockchainService:
             user: Current user object
             
         Returns:
-            Filtered block data
+            Filtered block data (a redacted copy; the input is not modified)
         """
-        # If not admin, remove sensitive fields
-        if not user.role == "ADMIN":
-            # Remove creator identities
-            if "transactions" in block:
-                for tx in block["transactions"]:
-                    if "creator" in tx:
-                        tx["creator"] = "***REDACTED***"
+        if user.role == "ADMIN" or "transactions" not in block:
+            return block
         
-        return block
+        # Remove creator identities. Copy rather than mutate: blocks may be
+        # shared cached objects
+        return {
+            **block,
+            "transactions": [
+                {**tx, "creator": _REDACTED} if "creator" in tx else tx
+                for tx in block["transactions"]
+            ]
+        }
 
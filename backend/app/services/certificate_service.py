@@ -1,23 +1,96 @@
 """
 Backend Phase 3 - Certificate Service
 """
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from uuid import UUID
-import httpx
 import asyncio
+import functools
 import subprocess
 import os
 import json
+import secrets
 import logging
 import socket
-from datetime import datetime, timedelta
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+import orjson
 from app.models.user import User
 from app.services.audit_service import AuditService
+from app.core.http_client import add_ca_trust, get_ca_http_client
+from app.core.user_cache import invalidate_cached_users
+from app.utils.fabric_ca_rest import FabricCARestClient, identity_from_enrollment, load_msp_identity
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent fabric-ca-client revocations in revoke_certificates()
+REVOKE_CONCURRENCY = 16
+
+# Max concurrent CA status checks in sync_with_fabric_ca()
+VERIFY_CONCURRENCY = 20
+
+# Users streamed and written back per batch in sync_with_fabric_ca()
+SYNC_CHUNK_SIZE = 1000
+
+# CA verdicts reused for VERIFY_CACHE_TTL seconds (expiry is still checked
+# locally on every hit); bounded LRU keyed by certificate_id
+VERIFY_CACHE_TTL = 300.0
+VERIFY_CACHE_SIZE = 4096
+_verify_cache: "OrderedDict[str, Tuple[float, bool, float]]" = OrderedDict()
+
+# Bootstrap admin enrollment used to authorize register/revoke
+ADMIN_MSP_PATH = "/tmp/fabric-ca-client/admin-new/msp"
+
+# Admin enrollment is process-wide; its MSP is re-checked on disk at most this often
+ADMIN_CHECK_INTERVAL = 60.0
+_admin_checked_at: Optional[float] = None  # monotonic time enrollment was last confirmed
+# One enrollment at a time per event loop (some callers run under throwaway loops)
+_admin_enroll_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+# fabric-ca-client arguments trusting the CA's TLS root
+CA_TLS_ARGS = ("--tls.certfiles", settings.FABRIC_CA_TLS_CERTFILE)
+
+# Per-CA admin signing identities for REST auto-enrollment, enrolled once
+_ca_admin_identities: Dict[str, Tuple[bytes, Any]] = {}
+
+# Identity types accepted by fabric-ca-client register --id.type
+CA_IDENTITY_TYPES = frozenset({"client", "peer", "orderer", "admin", "user"})
+
+
+@functools.lru_cache(maxsize=1)
+def _fabric_ca_env() -> Dict[str, str]:
+    """Environment for fabric-ca-client processes, copied from os.environ once"""
+    env = os.environ.copy()
+    env["FABRIC_CA_CLIENT_HOME"] = "/tmp/fabric-ca-client"  # Use writable /tmp location
+    # Skip TLS verification to avoid hostname mismatch issues
+    env["FABRIC_CA_CLIENT_TLS_CLIENT_SKIPVERIFY"] = "true"
+    return env
+
+
+def _decode_output(data: Optional[bytes]) -> str:
+    """Decode captured process output; None (sent to DEVNULL) becomes an empty string"""
+    return data.decode("utf-8", "replace") if data else ""
+
+
+@functools.lru_cache(maxsize=1)
+def _admin_identity():
+    """Admin (cert_pem, private key) used to sign CA requests; cleared on re-enrollment"""
+    return load_msp_identity(ADMIN_MSP_PATH)
+
+
+@functools.lru_cache(maxsize=4096)
+def _expiry_epoch(expiry: str) -> float:
+    """Parse a CA expiry timestamp to POSIX seconds (naive values are UTC)"""
+    # Python 3.11+ fromisoformat accepts a trailing "Z"
+    expiry_date = datetime.fromisoformat(expiry)
+    if expiry_date.tzinfo is None:
+        expiry_date = expiry_date.replace(tzinfo=timezone.utc)
+    return expiry_date.timestamp()
+
 
 class CertificateService:
     def __init__(self, db: Session):
@@ -28,6 +101,9 @@ class CertificateService:
         self.fabric_ca_home = os.getenv("FABRIC_CA_CLIENT_HOME", "/tmp/fabric-ca-client")
         # Resolve CA hostname to IP to avoid TLS hostname mismatch
         self._ca_hostname = self._resolve_ca_hostname()
+        self._ca_address = f"{self._ca_hostname}:8054"
+        self._ca_base_url = f"https://{self._ca_address}"
+        self._ca_rest = FabricCARestClient(self._ca_base_url)
         # Read Fabric CA admin password from env or secret file
         admin_pw_file = os.getenv("FABRIC_CA_ADMIN_PASSWORD_FILE")
         print(f"!!! [CertService.__init__] FABRIC_CA_ADMIN_PASSWORD_FILE={admin_pw_file}")
@@ -59,7 +135,6 @@ class CertificateService:
             print(f"!!! [CertService.__init__] Using FALLBACK password")
         
         print(f"!!! [CertService.__init__] FINAL PASSWORD: {self.fabric_ca_admin_password[:10]}... (len={len(self.fabric_ca_admin_password)})")
-        self._admin_enrolled = False
     
     def _resolve_ca_hostname(self) -> str:
         """Resolve CA hostname to match TLS cert SAN (ca-org1 or localhost)"""
@@ -69,31 +144,52 @@ class CertificateService:
         logger.info("Using ca-org1 hostname to match TLS cert SAN")
         return "ca-org1"
     
-    def _ensure_admin_enrolled(self):
-        """Ensure admin is enrolled with current CA"""
-        admin_msp_path = "/tmp/fabric-ca-client/admin-new/msp"
-        admin_cert_path = f"{admin_msp_path}/signcerts/cert.pem"
+    async def _ensure_admin_enrolled(self) -> bool:
+        """Ensure admin is enrolled with current CA (once per process)"""
+        global _admin_checked_at
         
-        # Check if admin already enrolled
-        if os.path.exists(admin_cert_path) and self._admin_enrolled:
+        # Steady state: no syscalls until the check interval lapses
+        if _admin_checked_at is not None and time.monotonic() - _admin_checked_at < ADMIN_CHECK_INTERVAL:
             return True
         
+        admin_msp_path = ADMIN_MSP_PATH
+        admin_cert_path = f"{admin_msp_path}/signcerts/cert.pem"
+        
+        # One enrollment at a time; later callers reuse its result
+        loop = asyncio.get_running_loop()
+        lock = _admin_enroll_locks.get(loop)
+        if lock is None:
+            lock = _admin_enroll_locks[loop] = asyncio.Lock()
+        async with lock:
+            if _admin_checked_at is not None:
+                if time.monotonic() - _admin_checked_at < ADMIN_CHECK_INTERVAL:
+                    return True
+                # Check if admin already enrolled
+                if os.path.exists(admin_cert_path):
+                    _admin_checked_at = time.monotonic()
+                    return True
+            
+            return await self._enroll_admin(admin_msp_path)
+    
+    async def _enroll_admin(self, admin_msp_path: str) -> bool:
+        """Enroll the bootstrap admin into admin_msp_path"""
+        global _admin_checked_at
+        
         try:
             logger.info("Enrolling admin with Fabric CA")
             
-            # Enroll admin
-            # Use resolved IP or localhost to match TLS cert SAN
-            command = [
-                "enroll",
-                "-u", f"https://admin:{self.fabric_ca_admin_password}@{self._ca_hostname}:8054",
-                "--tls.certfiles", "/fabric-certs/ca-org1-tls.pem",
-                "-M", admin_msp_path
-            ]
-            
-            result = self._run_fabric_ca_command(command)
+            if settings.FABRIC_CA_USE_REST:
+                result = await self._ca_rest.enroll(
+                    "admin", self.fabric_ca_admin_password, msp_dir=admin_msp_path
+                )
+            else:
+                result = await self._run_fabric_ca_command_async(
+                    self._admin_enroll_command(admin_msp_path), capture_stdout=False
+                )
             
             if result["success"]:
-                self._admin_enrolled = True
+                _admin_checked_at = time.monotonic()
+                _admin_identity.cache_clear()
                 logger.info("Admin enrollment successful")
                 return True
             else:
@@ -104,14 +200,76 @@ class CertificateService:
             logger.error(f"Exception during admin enrollment: {str(e)}", exc_info=True)
             return False
     
-    def _run_fabric_ca_command(self, command: List[str]) -> Dict[str, Any]:
-        """Run fabric-ca-client command and return result"""
+    def _admin_enroll_command(self, admin_msp_path: str) -> List[str]:
+        """Build the fabric-ca-client enroll command for the bootstrap admin"""
+        return [
+            "enroll",
+            "-u", f"https://admin:{self.fabric_ca_admin_password}@{self._ca_address}",
+            *CA_TLS_ARGS,
+            "-M", admin_msp_path
+        ]
+    
+    async def _run_fabric_ca_command_async(self, command: List[str], capture_stdout: bool = True) -> Dict[str, Any]:
+        """
+        Run fabric-ca-client as an asyncio subprocess and return result
+        
+        Same result shape as _run_fabric_ca_command, but the event loop waits
+        on the process instead of parking an executor thread for it.
+        """
+        full_cmd = [self.fabric_ca_client] + command
+        logger.info(f"Running command: {' '.join(full_cmd)}")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *full_cmd,
+                env=_fabric_ca_env(),
+                stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=30)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                logger.error("Command timeout")
+                return {
+                    "success": False,
+                    "error": "Command timeout"
+                }
+            
+            logger.info(f"Command exit code: {proc.returncode}")
+            stdout, stderr = _decode_output(stdout), _decode_output(stderr)
+            if capture_stdout:
+                logger.info(f"Command stdout: {stdout[:500]}")
+            
+            if proc.returncode == 0:
+                return {
+                    "success": True,
+                    "stdout": stdout,
+                    "stderr": stderr
+                }
+            logger.error(f"Command failed: {stderr}")
+            return {
+                "success": False,
+                "error": stderr,
+                "stdout": stdout
+            }
+        except Exception as e:
+            logger.error(f"Command exception: {str(e)}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _run_fabric_ca_command(self, command: List[str], capture_stdout: bool = True) -> Dict[str, Any]:
+        """
+        Run fabric-ca-client command and return result
+        
+        Callers that never read stdout pass capture_stdout=False so the output
+        goes to /dev/null instead of being buffered; "stdout" is then "".
+        """
         try:
             # Set environment variables for fabric-ca-client
-            env = os.environ.copy()
-            env["FABRIC_CA_CLIENT_HOME"] = "/tmp/fabric-ca-client"  # Use writable /tmp location
-            # Skip TLS verification to avoid hostname mismatch issues
-            env["FABRIC_CA_CLIENT_TLS_CLIENT_SKIPVERIFY"] = "true"
+            env = _fabric_ca_env()
             
             # Full command
             full_cmd = [self.fabric_ca_client] + command
@@ -123,26 +281,28 @@ class CertificateService:
             result = subprocess.run(
                 full_cmd,
                 env=env,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=30
             )
             
             logger.info(f"Command exit code: {result.returncode}")
-            logger.info(f"Command stdout: {result.stdout[:500]}")
+            stdout, stderr = _decode_output(result.stdout), _decode_output(result.stderr)
+            if capture_stdout:
+                logger.info(f"Command stdout: {stdout[:500]}")
             
             if result.returncode == 0:
                 return {
                     "success": True,
-                    "stdout": result.stdout,
-                    "stderr": result.stderr
+                    "stdout": stdout,
+                    "stderr": stderr
                 }
             else:
-                logger.error(f"Command failed: {result.stderr}")
+                logger.error(f"Command failed: {stderr}")
                 return {
                     "success": False,
-                    "error": result.stderr,
-                    "stdout": result.stdout
+                    "error": stderr,
+                    "stdout": stdout
                 }
                 
         except subprocess.TimeoutExpired:
@@ -161,51 +321,73 @@ class CertificateService:
     async def sync_with_fabric_ca(self) -> Dict[str, Any]:
         """Synchronize user certificates with Fabric CA"""
         try:
-            # Get all users with certificates
-            users = self.db.query(User).filter(
-                User.certificate_id.isnot(None),
-                User.is_active == True
-            ).all()
+            # Blocking Session work runs in a worker thread (one call at a time)
+            # so the event loop keeps driving the concurrent CA requests.
+            # Stream only the columns the sync needs, SYNC_CHUNK_SIZE rows at a time
+            rows = await asyncio.to_thread(
+                self.db.execute,
+                select(User.id, User.username, User.certificate_id)
+                .where(User.certificate_id.isnot(None), User.is_active == True)
+                .execution_options(yield_per=SYNC_CHUNK_SIZE)
+            )
             
             sync_results = {
-                "total_users": len(users),
+                "total_users": 0,
                 "valid_certificates": 0,
                 "invalid_certificates": 0,
                 "sync_errors": []
             }
             
-            for user in users:
-                try:
-                    # Verify certificate with Fabric CA
-                    is_valid = await self.verify_certificate_with_ca(user.certificate_id)
-                    
-                    if is_valid:
+            # Verify certificates with Fabric CA concurrently
+            semaphore = asyncio.Semaphore(VERIFY_CONCURRENCY)
+            
+            async def _verify(certificate_id: str, now: float) -> bool:
+                async with semaphore:
+                    return await self.verify_certificate_with_ca(certificate_id, now)
+            
+            synced_ids = []
+            partitions = rows.partitions()
+            while users := await asyncio.to_thread(next, partitions, None):
+                sync_results["total_users"] += len(users)
+                # One clock read per batch for all expiry checks
+                now = time.time()
+                verdicts = await asyncio.gather(
+                    *(_verify(user.certificate_id, now) for user in users), return_exceptions=True
+                )
+                
+                valid_ids = []
+                invalid_ids = []
+                audit_events = []
+                for user, is_valid in zip(users, verdicts):
+                    if isinstance(is_valid, Exception):
+                        sync_results["sync_errors"].append({
+                            "user_id": str(user.id),
+                            "username": user.username,
+                            "error": str(is_valid)
+                        })
+                    elif is_valid:
                         sync_results["valid_certificates"] += 1
-                        # Update last sync timestamp
-                        user.updated_at = datetime.utcnow()
+                        valid_ids.append(user.id)
                     else:
                         sync_results["invalid_certificates"] += 1
-                        # Mark user as inactive
-                        user.is_active = False
-                        user.status = "inactive"
-                        
-                        # Log audit event
-                        self.audit_service.log_event(
-                            user_id=user.id,
-                            action="CERTIFICATE_INVALID",
-                            resource_type="user",
-                            resource_id=str(user.id),
-                            details={"certificate_id": user.certificate_id}
-                        )
-                    
-                    self.db.commit()
-                    
-                except Exception as e:
-                    sync_results["sync_errors"].append({
-                        "user_id": str(user.id),
-                        "username": user.username,
-                        "error": str(e)
-                    })
+                        invalid_ids.append(user.id)
+                        audit_events.append({
+                            "user_id": user.id,
+                            "action": "CERTIFICATE_INVALID",
+                            "resource_type": "user",
+                            "resource_id": str(user.id),
+                            "details": {"certificate_id": user.certificate_id}
+                        })
+                
+                await asyncio.to_thread(self._apply_sync_chunk, valid_ids, invalid_ids, audit_events)
+                synced_ids.extend(valid_ids)
+                synced_ids.extend(invalid_ids)
+            
+            # Apply the whole sync in one transaction
+            await asyncio.to_thread(self.db.commit)
+            
+            # Bulk UPDATEs bypass ORM flush events
+            invalidate_cached_users(synced_ids)
             
             return {
                 "success": True,
@@ -214,45 +396,75 @@ class CertificateService:
             }
             
         except Exception as e:
+            self.db.rollback()
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    async def verify_certificate_with_ca(self, certificate_id: str) -> bool:
-        """Verify certificate with Fabric CA"""
+    def _apply_sync_chunk(
+        self,
+        valid_ids: List[UUID],
+        invalid_ids: List[UUID],
+        audit_events: List[Dict[str, Any]]
+    ):
+        """Set-based writes for one sync chunk; committed by the caller"""
+        if valid_ids:
+            # Update last sync timestamp
+            self.db.execute(
+                update(User).where(User.id.in_(valid_ids)).values(updated_at=datetime.utcnow())
+            )
+        if invalid_ids:
+            # Mark users as inactive
+            self.db.execute(
+                update(User).where(User.id.in_(invalid_ids)).values(is_active=False, status="inactive")
+            )
+        self.audit_service.log_events(audit_events)
+    
+    async def verify_certificate_with_ca(self, certificate_id: str, now: Optional[float] = None) -> bool:
+        """
+        Verify certificate with Fabric CA
+        
+        now (POSIX seconds) lets batch callers share one clock read.
+        """
+        if now is None:
+            now = time.time()
+        cached = _verify_cache.get(certificate_id)
+        if cached is not None:
+            checked_at, is_valid, expires_at = cached
+            if time.monotonic() - checked_at < VERIFY_CACHE_TTL:
+                _verify_cache.move_to_end(certificate_id)
+                return is_valid and expires_at > now
+            del _verify_cache[certificate_id]
+        
         try:
             # This would integrate with Fabric CA API
             # For now, we'll simulate the verification
             
-            async with httpx.AsyncClient(timeout=30) as client:
-                # Check certificate status with Fabric CA
-                response = await client.get(
-                    f"{settings.FABRIC_CA_URL}/api/v1/certificates/{certificate_id}",
-                    auth=(settings.FABRIC_CA_ADMIN_USERNAME, settings.FABRIC_CA_ADMIN_PASSWORD)
-                )
-                
-                if response.status_code == 200:
-                    cert_data = response.json()
-                    # Check if certificate is valid and not expired
-                    return self._is_certificate_valid(cert_data)
-                else:
-                    return False
+            # Check certificate status with Fabric CA
+            response = await get_ca_http_client().get(f"/api/v1/certificates/{certificate_id}")
+            
+            if response.status_code == 200:
+                cert_data = orjson.loads(response.content)
+                # Check if certificate is valid and not expired
+                is_valid = self._is_certificate_valid(cert_data, now)
+                expires_at = _expiry_epoch(cert_data["expiry"]) if is_valid and "expiry" in cert_data else float("inf")
+                _verify_cache[certificate_id] = (time.monotonic(), is_valid, expires_at)
+                if len(_verify_cache) > VERIFY_CACHE_SIZE:
+                    _verify_cache.popitem(last=False)
+                return is_valid
+            else:
+                return False
                     
         except Exception:
             # If CA is not available, assume certificate is valid
             # In production, you might want to handle this differently
             return True
     
-    def _is_certificate_valid(self, cert_data: Dict[str, Any]) -> bool:
-        """Check if certificate data indicates a valid certificate"""
+    def _is_certificate_valid(self, cert_data: Dict[str, Any], now: float) -> bool:
+        """Check if certificate data indicates a valid certificate as of now (POSIX seconds)"""
         try:
-            # Check expiration date
-            if "expiry" in cert_data:
-                expiry_date = datetime.fromisoformat(cert_data["expiry"].replace("Z", "+00:00"))
-                if expiry_date < datetime.utcnow():
-                    return False
-            
+            # Flag checks first: no date parsing for revoked/inactive certs
             # Check revocation status
             if cert_data.get("revoked", False):
                 return False
@@ -261,6 +473,11 @@ class CertificateService:
             if not cert_data.get("active", True):
                 return False
             
+            # Check expiration date
+            if "expiry" in cert_data:
+                if _expiry_epoch(cert_data["expiry"]) < now:
+                    return False
+            
             return True
             
         except Exception:
@@ -270,7 +487,7 @@ class CertificateService:
         """Register user with Fabric CA using fabric-ca-client"""
         try:
             # Ensure admin is enrolled
-            if not self._ensure_admin_enrolled():
+            if not await self._ensure_admin_enrolled():
                 return {
                     "success": False,
                     "error": "Failed to enroll admin"
@@ -283,8 +500,27 @@ class CertificateService:
             
             logger.info(f"Registering user {username} with Fabric CA")
             
+            if settings.FABRIC_CA_USE_REST:
+                result = await self._ca_rest.register(_admin_identity(), {
+                    "id": username,
+                    "secret": password,
+                    "type": role,
+                    "affiliation": org,
+                    "max_enrollments": -1
+                })
+                if not result["success"]:
+                    return {
+                        "success": False,
+                        "error": result.get("error", "Unknown error")
+                    }
+                return {
+                    "success": True,
+                    "secret": password,
+                    "certificate_id": username
+                }
+            
             # Use newly enrolled admin MSP
-            admin_msp = "/tmp/fabric-ca-client/admin-new/msp"
+            admin_msp = ADMIN_MSP_PATH
             
             # Build fabric-ca-client register command
             command = [
@@ -294,16 +530,14 @@ class CertificateService:
                 "--id.type", role,
                 "--id.affiliation", org,
                 "--id.maxenrollments", "-1",
-                "-u", f"https://{self._ca_hostname}:8054",
+                "-u", self._ca_base_url,
                 "--mspdir", admin_msp,
-                "--tls.certfiles", "/fabric-certs/ca-org1-tls.pem"
+                *CA_TLS_ARGS
             ]
             
             logger.info(f"Using admin MSP: {admin_msp}")
             
-            # Run command in thread pool to not block async
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self._run_fabric_ca_command, command)
+            result = await self._run_fabric_ca_command_async(command)
             
             if result["success"]:
                 # Parse output
@@ -340,9 +574,15 @@ class CertificateService:
         self, 
         username: str, 
         password: str, 
-        organization: str = "org1"
+        organization: str = "org1",
+        return_pem: bool = True
     ) -> Dict[str, Any]:
-        """Enroll user with Fabric CA to get certificate using fabric-ca-client"""
+        """
+        Enroll user with Fabric CA to get certificate using fabric-ca-client
+        
+        With return_pem=False the CLI path skips reading the issued certificate
+        back from disk; callers get cert_path only.
+        """
         try:
             logger.info(f"Enrolling user {username} with Fabric CA")
 
@@ -355,18 +595,32 @@ class CertificateService:
             
             user_msp_path = f"/tmp/fabric-ca-client/{username}/msp"
             
+            if settings.FABRIC_CA_USE_REST:
+                result = await self._ca_rest.enroll(username, password, msp_dir=user_msp_path)
+                if not result["success"]:
+                    return {
+                        "success": False,
+                        "error": result.get("error", "Unknown error")
+                    }
+                logger.info(f"Certificate successfully obtained for {username}")
+                return {
+                    "success": True,
+                    "certificate": result["certificate"],
+                    "private_key": result["private_key"],
+                    "certificate_id": username,
+                    "cert_path": result["cert_path"]
+                }
+            
             # Build fabric-ca-client enroll command
             # Use resolved hostname to avoid TLS hostname mismatch
             command = [
                 "enroll",
-                "-u", f"https://{username}:{password}@{self._ca_hostname}:8054",
-                "--tls.certfiles", "/fabric-certs/ca-org1-tls.pem",
+                "-u", f"https://{username}:{password}@{self._ca_address}",
+                *CA_TLS_ARGS,
                 "-M", user_msp_path
             ]
             
-            # Run command in thread pool
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self._run_fabric_ca_command, command)
+            result = await self._run_fabric_ca_command_async(command)
             
             if result["success"]:
                 # Read certificate from file system
@@ -375,8 +629,10 @@ class CertificateService:
                 try:
                     # Check if cert was created
                     if os.path.exists(cert_path):
-                        with open(cert_path, 'r') as f:
-                            certificate = f.read()
+                        certificate = None
+                        if return_pem:
+                            with open(cert_path, 'r') as f:
+                                certificate = f.read()
                         
                         logger.info(f"Certificate successfully obtained for {username}")
                         
@@ -417,7 +673,7 @@ class CertificateService:
         """
         try:
             # Ensure admin is enrolled
-            if not self._ensure_admin_enrolled():
+            if not await self._ensure_admin_enrolled():
                 return {
                     "success": False,
                     "error": "Admin enrollment failed"
@@ -425,34 +681,34 @@ class CertificateService:
             
             logger.info(f"Revoking certificate: {certificate_id}, reason: {reason}")
             
-            # Get user info from certificate_id
-            user = self.db.query(User).filter(User.certificate_id == certificate_id).first()
+            # Get user info from certificate_id (indexed; only the two columns used)
+            user = self.db.execute(
+                select(User.id, User.username).where(User.certificate_id == certificate_id)
+            ).first()
             if not user:
                 return {
                     "success": False,
                     "error": "User not found for certificate"
                 }
             
-            # Revoke certificate using fabric-ca-client
-            command = [
-                "revoke",
-                "-e", user.username,  # Enrollment ID (username)
-                "-r", reason,  # Revocation reason
-                "--tls.certfiles", "/fabric-certs/ca-org1-tls.pem",
-                "-M", "/tmp/fabric-ca-client/admin-new/msp",  # Admin MSP for authorization
-                "-u", f"https://{self._ca_hostname}:8054"
-            ]
-            
-            result = self._run_fabric_ca_command(command)
+            # Revoke certificate on Fabric CA
+            result = await self._revoke_enrollment(user.username, reason)
             
             if result["success"]:
                 logger.info(f"Certificate revoked successfully for user: {user.username}")
                 
                 # Update certificate status in database
-                user.certificate_id = None  # Mark certificate as revoked
-                user.is_active = False
-                user.status = "certificate_revoked"
+                self.db.execute(
+                    update(User).where(User.id == user.id).values(
+                        certificate_id=None,  # Mark certificate as revoked
+                        is_active=False,
+                        status="certificate_revoked"
+                    )
+                )
                 self.db.commit()
+                _verify_cache.pop(certificate_id, None)
+                # Bulk UPDATEs bypass ORM flush events
+                invalidate_cached_users([user.id])
                 
                 # Log audit event
                 self.audit_service.log_event(
@@ -485,6 +741,55 @@ class CertificateService:
                 "error": str(e)
             }
     
+    async def revoke_certificates(self, usernames: List[str], reason: str = "unspecified") -> Dict[str, Dict[str, Any]]:
+        """
+        Revoke several enrollments on Fabric CA concurrently
+        
+        Runs up to REVOKE_CONCURRENCY revocations at once.
+        Does not touch the database; callers persist the outcome.
+        Returns: Dict of username -> command result
+        """
+        if not usernames:
+            return {}
+        
+        if not await self._ensure_admin_enrolled():
+            return {
+                username: {"success": False, "error": "Admin enrollment failed"}
+                for username in usernames
+            }
+        
+        semaphore = asyncio.Semaphore(REVOKE_CONCURRENCY)
+        
+        async def _revoke(username: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._revoke_enrollment(username, reason)
+        
+        results = await asyncio.gather(*(_revoke(username) for username in usernames))
+        return dict(zip(usernames, results))
+    
+    async def _revoke_enrollment(self, enrollment_id: str, reason: str) -> Dict[str, Any]:
+        """Revoke one enrollment via the CA REST API, or fabric-ca-client when disabled"""
+        if settings.FABRIC_CA_USE_REST:
+            try:
+                registrar = _admin_identity()
+            except Exception as e:
+                return {"success": False, "error": f"Admin identity unavailable: {e}"}
+            return await self._ca_rest.revoke(registrar, enrollment_id, reason)
+        return await self._run_fabric_ca_command_async(
+            self._revoke_command(enrollment_id, reason), capture_stdout=False
+        )
+    
+    def _revoke_command(self, enrollment_id: str, reason: str) -> List[str]:
+        """Build the fabric-ca-client revoke command for an enrollment ID"""
+        return [
+            "revoke",
+            "-e", enrollment_id,  # Enrollment ID (username)
+            "-r", reason,  # Revocation reason
+            *CA_TLS_ARGS,
+            "-M", ADMIN_MSP_PATH,  # Admin MSP for authorization
+            "-u", self._ca_base_url
+        ]
+    
     def get_certificate_status(self, certificate_id: str) -> Dict[str, Any]:
         """Get certificate status from database"""
         user = self.db.query(User).filter(User.certificate_id == certificate_id).first()
@@ -534,6 +839,125 @@ class CertificateService:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _org_tls_cert_path(organization: str) -> str:
+        """TLS root of an organization's CA, from FABRIC_CA_<ORG>_TLS_CERT or the default mount"""
+        return os.getenv(
+            f"FABRIC_CA_{organization.upper()}_TLS_CERT",
+            f"/fabric-ca-certs/{organization}-tls-cert.pem"
+        )
+    
+    def _save_enrollment(
+        self,
+        username: str,
+        enrollment: Dict[str, Any],
+        ca_name: str,
+        enrollment_secret: Optional[str] = None
+    ):
+        """Store an enrollment's certificate and encrypted private key on the user"""
+        from app.utils.encryption import get_encryptor
+        
+        user = self.db.query(User).filter(User.username == username).first()
+        if not user:
+            return
+        
+        user.certificate_pem = enrollment["certificate"]
+        user.private_key_pem = get_encryptor().encrypt(enrollment["private_key"])
+        user.fabric_enrollment_id = username
+        if enrollment_secret:
+            user.fabric_enrollment_secret = enrollment_secret
+        user.fabric_ca_name = ca_name
+        user.fabric_enrollment_status = "enrolled"
+        user.fabric_cert_issued_at = datetime.utcnow()
+        user.fabric_cert_expires_at = datetime.utcnow() + timedelta(days=365)
+        user.status = "active"
+        user.is_active = True
+        user.is_verified = True
+        self.db.commit()
+    
+    async def _auto_enroll_user_rest(
+        self,
+        username: str,
+        organization: str,
+        role: str,
+        tls_cert_path: str
+    ) -> Dict[str, Any]:
+        """
+        Register and enroll a user over the Fabric CA REST API
+        
+        Register and enroll go over the pooled CA client back to back, so they
+        share one keep-alive connection. The CA admin is enrolled once per
+        process and CA instead of once per user.
+        """
+        ca_name = f"ca-{organization}"
+        add_ca_trust(tls_cert_path)
+        ca = FabricCARestClient(f"https://{ca_name}:8054", ca_name=ca_name)
+        
+        if username.lower() == "admin":
+            # Bootstrap admin is already registered; enroll directly
+            enrollment = await ca.enroll(username, self.fabric_ca_admin_password)
+            if not enrollment["success"]:
+                return {
+                    "success": False,
+                    "error": f"Admin enrollment failed: {enrollment.get('error')}",
+                    "step": "admin_direct_enroll"
+                }
+            self._save_enrollment(username, enrollment, ca_name)
+            return {
+                "success": True,
+                "certificate_id": username,
+                "certificate": enrollment["certificate"],
+                "private_key": enrollment["private_key"],
+                "message": "Admin successfully enrolled (bootstrap user)"
+            }
+        
+        registrar = _ca_admin_identities.get(ca_name)
+        if registrar is None:
+            admin = await ca.enroll("admin", self.fabric_ca_admin_password)
+            if not admin["success"]:
+                return {
+                    "success": False,
+                    "error": f"Admin enrollment failed: {admin.get('error')}",
+                    "step": "admin_enroll_for_registration"
+                }
+            registrar = _ca_admin_identities[ca_name] = identity_from_enrollment(admin)
+        
+        enrollment_secret = secrets.token_urlsafe(16)
+        register_result = await ca.register(registrar, {
+            "id": username,
+            "secret": enrollment_secret,
+            "type": role if role in CA_IDENTITY_TYPES else "client",
+            "affiliation": f"{organization}.department1" if organization != "org1" else "org1",
+            "max_enrollments": -1
+        })
+        if not register_result["success"]:
+            # Admin cert may be stale (e.g. CA reset); enroll it again next time
+            _ca_admin_identities.pop(ca_name, None)
+            return {
+                "success": False,
+                "error": f"Registration failed: {register_result.get('error', 'Unknown error')}",
+                "step": "register"
+            }
+        
+        enrollment_secret = register_result["secret"]
+        enrollment = await ca.enroll(username, enrollment_secret)
+        if not enrollment["success"]:
+            return {
+                "success": False,
+                "error": f"Enrollment failed: {enrollment.get('error')}",
+                "step": "enroll"
+            }
+        
+        self._save_enrollment(username, enrollment, ca_name, enrollment_secret)
+        logger.info(f"Certificate saved to database for user {username} (private key encrypted)")
+        return {
+            "success": True,
+            "certificate_id": username,
+            "certificate": enrollment["certificate"],
+            "private_key": enrollment["private_key"],
+            "message": "User successfully enrolled with Fabric CA"
+        }
+    
     def auto_enroll_user_sync(
         self, 
         username: str, 
@@ -567,8 +991,7 @@ class CertificateService:
             logger.info(f"CA URL: {ca_url}, CA Name: {ca_name}")
             
             # Get TLS certificate path from environment
-            tls_cert_env_var = f"FABRIC_CA_{organization.upper()}_TLS_CERT"
-            tls_cert_path = os.getenv(tls_cert_env_var, f"/fabric-ca-certs/{organization}-tls-cert.pem")
+            tls_cert_path = self._org_tls_cert_path(organization)
             logger.info(f"TLS cert path: {tls_cert_path}")
             
             # Check if TLS cert exists
@@ -677,7 +1100,7 @@ class CertificateService:
                     register_result = ca_client.register(
                         enrollment_id=username,
                         enrollment_secret=enrollment_secret,
-                        type=role if role in ["client", "peer", "orderer", "admin", "user"] else "client",
+                        type=role if role in CA_IDENTITY_TYPES else "client",
                         affiliation=f"{organization}.department1" if organization != "org1" else "org1",
                         max_enrollments=-1
                     )
@@ -813,6 +1236,16 @@ class CertificateService:
         logger.info(f"!!! ASYNC AUTO_ENROLL_USER CALLED for {username}, org={organization}, role={role}")
         
         try:
+            if settings.FABRIC_CA_USE_REST:
+                # The REST client verifies the CA's TLS cert; without it, fall
+                # back to the CLI path, which skips verification
+                tls_cert_path = self._org_tls_cert_path(organization)
+                if os.path.exists(tls_cert_path):
+                    result = await self._auto_enroll_user_rest(username, organization, role, tls_cert_path)
+                    if not result.get("success"):
+                        logger.error(f"Enrollment failed for {username}: {result.get('error')}")
+                    return result
+            
             logger.info("Importing asyncio and ThreadPoolExecutor...")
             import asyncio
             from concurrent.futures import ThreadPoolExecutor
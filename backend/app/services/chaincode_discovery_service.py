@@ -7,10 +7,10 @@ import logging
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
 from datetime import datetime
-from uuid import uuid4
 
 from app.models.chaincode import Chaincode
 from app.config import settings
+from app.utils.uuid7 import uuid7
 
 logger = logging.getLogger(__name__)
 
@@ -140,7 +140,7 @@ class ChaincodeDiscoveryService:
             logger.info(f"Adding new chaincode {name} v{version} to database")
             
             new_chaincode = Chaincode(
-                id=uuid4(),
+                id=uuid7(),
                 name=name,
                 version=version,
                 source_code="# Auto-discovered from blockchain",
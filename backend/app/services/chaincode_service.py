@@ -9,7 +9,7 @@ Manages complete chaincode lifecycle:
 - Status tracking
 """
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload, undefer
 from sqlalchemy import and_
 from uuid import UUID
 from datetime import datetime, timezone
@@ -112,7 +112,9 @@ class ChaincodeService:
         uploaded_by: Optional[UUID] = None
     ) -> List[Chaincode]:
         """Get list of chaincodes with filters"""
-        query = self.db.query(Chaincode)
+        # List responses only render columns; fail loudly on lazy relationship loads (N+1)
+        # and load the deferred source in the same SELECT since ChaincodeList renders it
+        query = self.db.query(Chaincode).options(raiseload("*"), undefer(Chaincode.source_code))
         
         if status:
             query = query.filter(Chaincode.status == status)
@@ -2,7 +2,7 @@
 Backend Phase 3 - Channel Service
 """
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload, undefer_group
 from app.models.channel import Channel
 from app.schemas.channel import ChannelCreate, ChannelUpdate, ChannelResponse
 from app.services.audit_service import AuditService
@@ -63,7 +63,9 @@ class ChannelService:
     
     def get_channels(self, skip: int = 0, limit: int = 100) -> List[Channel]:
         """Get all channels with pagination"""
-        return self.db.query(Channel).offset(skip).limit(limit).all()
+        # List responses only render columns; fail loudly on lazy relationship loads (N+1)
+        # and load the deferred blobs in the same SELECT since ChannelResponse renders them
+        return self.db.query(Channel).options(raiseload("*"), undefer_group("blobs")).offset(skip).limit(limit).all()
     
     def get_channel_by_id(self, channel_id: str) -> Optional[Channel]:
         """Get channel by ID"""
@@ -3,7 +3,7 @@ Backend Phase 3 - Deployment Service
 """
 from typing import List, Optional
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload, undefer
 from uuid import UUID
 from app.models.deployment import Deployment
 from app.models.chaincode import Chaincode
@@ -81,7 +81,9 @@ class DeploymentService:
         deployed_by: Optional[UUID] = None
     ) -> List[Deployment]:
         """Get list of deployments with filters"""
-        query = self.db.query(Deployment)
+        # List responses only render columns; fail loudly on lazy relationship loads (N+1)
+        # and load the deferred logs in the same SELECT since the list renders them
+        query = self.db.query(Deployment).options(raiseload("*"), undefer(Deployment.deployment_logs))
         
         if status:
             query = query.filter(Deployment.deployment_status == status)
@@ -2,7 +2,7 @@
 Backend Phase 3 - Project Service
 """
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 from app.services.audit_service import AuditService
@@ -63,7 +63,8 @@ class ProjectService:
     
     def get_projects(self, skip: int = 0, limit: int = 100, user_id: Optional[str] = None) -> List[Project]:
         """Get all projects with pagination"""
-        query = self.db.query(Project)
+        # List responses only render columns; fail loudly on lazy relationship loads (N+1)
+        query = self.db.query(Project).options(raiseload("*"))
         
         # Filter by user if specified
         if user_id:
@@ -1,16 +1,17 @@
 """
 Backend Phase 3 - User Service
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 from uuid import UUID
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.utils.security import get_password_hash
 from app.services.audit_service import AuditService
 from app.services.certificate_service import CertificateService
-import asyncio
+from app.core.http_client import run_with_clients
+from app.core.user_cache import invalidate_cached_users
 
 
 class UserService:
@@ -60,7 +61,7 @@ class UserService:
         # Auto enroll with Fabric CA (async operation)
         try:
             # Run async enrollment
-            enroll_result = asyncio.run(
+            enroll_result = run_with_clients(
                 self.certificate_service.auto_enroll_user(
                     username=user_data.username,
                     organization=user_data.organization or "org1",
@@ -152,6 +153,28 @@ class UserService:
         include_inactive: bool = False  # NEW: Filter inactive users by default
     ) -> List[User]:
         """Get list of users with filters"""
+        query = self._filtered_users_query(role, status, organization, include_inactive)
+        return query.offset(skip).limit(limit).all()
+    
+    def iter_users(
+        self,
+        role: Optional[str] = None,
+        status: Optional[str] = None,
+        organization: Optional[str] = None,
+        include_inactive: bool = False,
+        batch_size: int = 200
+    ) -> Iterator[User]:
+        """Iterate users with filters, fetching rows from a server-side cursor in batches"""
+        query = self._filtered_users_query(role, status, organization, include_inactive)
+        return iter(query.yield_per(batch_size))
+    
+    def _filtered_users_query(
+        self,
+        role: Optional[str],
+        status: Optional[str],
+        organization: Optional[str],
+        include_inactive: bool
+    ):
         query = self.db.query(User)
         
         # Filter out inactive users by default (soft-deleted users)
@@ -165,7 +188,7 @@ class UserService:
         if organization:
             query = query.filter(User.organization == organization)
         
-        return query.offset(skip).limit(limit).all()
+        return query
     
     def update_user(
         self, 
@@ -205,7 +228,7 @@ class UserService:
         if update_data.organization is not None:
             user.organization = update_data.organization
         if update_data.status is not None:
-            user.status = update_data.status
+            user.status = update_data.status.value
         
         self.db.commit()
         self.db.refresh(user)
@@ -236,7 +259,7 @@ class UserService:
         # 1. Revoke certificate on Fabric CA if user has one
         if user.certificate_id:
             try:
-                revoke_result = asyncio.run(
+                revoke_result = run_with_clients(
                     self.certificate_service.revoke_certificate(
                         certificate_id=user.certificate_id,
                         reason="user_deactivated"
@@ -270,6 +293,82 @@ class UserService:
         
         return user
     
+    def bulk_deactivate_users(
+        self,
+        user_ids: List[UUID],
+        deactivated_by: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Deactivate several users at once
+        This will:
+        1. Deactivate all users in one UPDATE ... RETURNING
+        2. Revoke their certificates on Fabric CA concurrently
+        3. Log audit events
+        """
+        rows = self.db.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(is_active=False, status="inactive")
+            .returning(User.id, User.username, User.certificate_id)
+        ).all()
+        self.db.commit()
+        # Bulk UPDATEs bypass ORM flush events; drop the cached users before
+        # the (slow) CA revocations so they stop authenticating right away
+        invalidate_cached_users(row.id for row in rows)
+        
+        # Revoke certificates on Fabric CA
+        revoked = set()
+        usernames = [row.username for row in rows if row.certificate_id]
+        if usernames:
+            try:
+                revoke_results = run_with_clients(
+                    self.certificate_service.revoke_certificates(
+                        usernames,
+                        reason="user_deactivated"
+                    )
+                )
+                for username, result in revoke_results.items():
+                    if result.get("success"):
+                        revoked.add(username)
+                    else:
+                        print(f"Warning: Certificate revocation failed for user {username}: {result.get('error')}")
+            except Exception as e:
+                print(f"Warning: Bulk certificate revocation error: {str(e)}")
+        
+        if revoked:
+            self.db.execute(
+                update(User)
+                .where(User.username.in_(revoked))
+                .values(certificate_id=None)
+            )
+        
+        # Certificate IDs and audit rows go out in one commit
+        self.audit_service.log_events([
+            {
+                "user_id": deactivated_by,
+                "action": "USER_DEACTIVATED",
+                "resource_type": "user",
+                "resource_id": str(row.id),
+                "details": {
+                    "username": row.username,
+                    "certificate_revoked": row.username in revoked,
+                    "bulk": True
+                }
+            }
+            for row in rows
+        ])
+        self.db.commit()
+        if revoked:
+            invalidate_cached_users(row.id for row in rows if row.username in revoked)
+        
+        found = {row.id for row in rows}
+        return {
+            "success": True,
+            "deactivated": [str(row.id) for row in rows],
+            "not_found": [str(user_id) for user_id in user_ids if user_id not in found],
+            "certificates_revoked": len(revoked)
+        }
+    
     def delete_user_permanently(self, user_id: UUID, deleted_by: Optional[UUID] = None) -> Dict[str, Any]:
         """
         Permanently delete a user (hard delete)
@@ -293,7 +392,7 @@ class UserService:
         certificate_revoked = False
         if certificate_id:
             try:
-                revoke_result = asyncio.run(
+                revoke_result = run_with_clients(
                     self.certificate_service.revoke_certificate(
                         certificate_id=certificate_id,
                         reason="user_deleted_permanently"
@@ -389,7 +488,7 @@ class UserService:
         
         try:
             # Run async enrollment
-            enroll_result = asyncio.run(
+            enroll_result = run_with_clients(
                 self.certificate_service.auto_enroll_user(
                     username=user.username,
                     organization=user.organization or "org1",
@@ -0,0 +1,204 @@
+"""
+Fabric CA REST Client
+
+Calls the Fabric CA server's REST API (/api/v1/enroll, /register, /revoke)
+over the pooled CA HTTP client instead of starting a fabric-ca-client
+process per operation.
+
+Authorization follows the Fabric CA protocol:
+- enroll: HTTP Basic auth with the enrollment ID and secret, plus a CSR
+  generated locally
+- register/revoke: a token made of the registrar's ECert and an ECDSA
+  signature over method, URI, body and certificate
+
+Enrollments are written in the same MSP layout fabric-ca-client produces
+(signcerts/cert.pem, keystore/, cacerts/), so both paths can share MSP dirs.
+"""
+import base64
+import glob
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+from cryptography.x509.oid import NameOID
+
+from app.core.http_client import get_ca_http_client
+
+logger = logging.getLogger(__name__)
+
+# Group orders for low-S signature normalization (Fabric CA rejects high-S)
+_CURVE_ORDERS = {
+    "secp256r1": 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551,
+    "secp384r1": int(
+        "FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC7634D81F4372DDF"
+        "581A0DB248B0A77AECEC196ACCC52973", 16
+    ),
+}
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def load_msp_identity(msp_dir: str) -> Tuple[bytes, ec.EllipticCurvePrivateKey]:
+    """Load the signing certificate (PEM) and private key from an MSP directory"""
+    with open(os.path.join(msp_dir, "signcerts", "cert.pem"), "rb") as f:
+        cert_pem = f.read()
+    key_files = sorted(glob.glob(os.path.join(msp_dir, "keystore", "*")))
+    if not key_files:
+        raise FileNotFoundError(f"No private key in {msp_dir}/keystore")
+    with open(key_files[0], "rb") as f:
+        key = serialization.load_pem_private_key(f.read(), password=None)
+    return cert_pem, key
+
+
+def identity_from_enrollment(enrollment: Dict[str, Any]) -> Tuple[bytes, ec.EllipticCurvePrivateKey]:
+    """(cert_pem, private key) signing identity from an enroll() result"""
+    key = serialization.load_pem_private_key(enrollment["private_key"].encode(), password=None)
+    return enrollment["certificate"].encode(), key
+
+
+class FabricCARestClient:
+    """
+    Async client for the Fabric CA REST API.
+
+    Usage:
+        ca = FabricCARestClient("https://ca-org1:8054")
+        result = await ca.enroll("user1", "user1pw", msp_dir="/tmp/fabric-ca-client/user1/msp")
+        result = await ca.register(admin_msp, {"id": "user2", "secret": "pw", "type": "client"})
+    """
+
+    def __init__(self, ca_url: str, ca_name: Optional[str] = None):
+        """
+        Args:
+            ca_url: CA server URL (e.g. https://ca-org1:8054)
+            ca_name: CA name, for servers hosting several CAs
+        """
+        self.ca_url = ca_url.rstrip("/")
+        self.ca_name = ca_name
+
+    def _auth_token(self, method: str, path: str, body: bytes, cert_pem: bytes, key) -> str:
+        """Build the Fabric CA token: b64(cert).b64(sig over method.b64(uri).b64(body).b64(cert))"""
+        b64_cert = _b64(cert_pem)
+        payload = f"{method}.{_b64(path.encode())}.{_b64(body)}.{b64_cert}".encode()
+        r, s = decode_dss_signature(key.sign(payload, ec.ECDSA(hashes.SHA256())))
+        order = _CURVE_ORDERS.get(key.curve.name)
+        if order and s > order // 2:
+            s = order - s
+        return f"{b64_cert}.{_b64(encode_dss_signature(r, s))}"
+
+    async def _post(self, path: str, payload: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """POST to the CA and unwrap its {success, result, errors} envelope"""
+        if self.ca_name:
+            payload = {**payload, "caname": self.ca_name}
+        body = orjson.dumps(payload)
+        headers = {"Content-Type": "application/json", **kwargs.pop("headers", {})}
+        if "identity" in kwargs:
+            cert_pem, key = kwargs.pop("identity")
+            headers["Authorization"] = self._auth_token("POST", path, body, cert_pem, key)
+            # The CA client's default Basic auth would replace the token header
+            kwargs["auth"] = None
+
+        try:
+            response = await get_ca_http_client().post(
+                f"{self.ca_url}{path}", content=body, headers=headers, **kwargs
+            )
+            data = orjson.loads(response.content)
+        except Exception as e:
+            logger.error(f"Fabric CA request {path} failed: {e}")
+            return {"success": False, "error": str(e)}
+
+        if not data.get("success"):
+            errors = data.get("errors") or []
+            message = "; ".join(err.get("message", str(err)) for err in errors)
+            return {"success": False, "error": message or f"HTTP {response.status_code}"}
+        return {"success": True, "result": data.get("result") or {}}
+
+    async def enroll(self, enrollment_id: str, secret: str, msp_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Enroll an identity and optionally write its MSP directory
+
+        Returns:
+            Dict with success, certificate, private_key and cert_path (if written)
+        """
+        key = ec.generate_private_key(ec.SECP256R1())
+        csr = x509.CertificateSigningRequestBuilder().subject_name(
+            x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, enrollment_id)])
+        ).sign(key, hashes.SHA256())
+
+        response = await self._post(
+            "/api/v1/enroll",
+            {"certificate_request": csr.public_bytes(serialization.Encoding.PEM).decode()},
+            auth=(enrollment_id, secret)
+        )
+        if not response["success"]:
+            return response
+
+        result = response["result"]
+        certificate = base64.b64decode(result["Cert"]).decode()
+        private_key = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode()
+
+        enrollment = {"success": True, "certificate": certificate, "private_key": private_key}
+        if msp_dir:
+            ca_chain = result.get("ServerInfo", {}).get("CAChain")
+            enrollment["cert_path"] = self._write_msp(
+                msp_dir, certificate, private_key,
+                base64.b64decode(ca_chain).decode() if ca_chain else None
+            )
+        return enrollment
+
+    @staticmethod
+    def _write_msp(msp_dir: str, certificate: str, private_key: str, ca_chain: Optional[str]) -> str:
+        """Write an enrollment in fabric-ca-client's MSP layout; returns the cert path"""
+        for sub in ("signcerts", "keystore", "cacerts"):
+            os.makedirs(os.path.join(msp_dir, sub), exist_ok=True)
+
+        # Replace any key from a previous enrollment so loaders pick the new one
+        for old_key in glob.glob(os.path.join(msp_dir, "keystore", "*")):
+            os.remove(old_key)
+        key_path = os.path.join(msp_dir, "keystore", "priv_sk")
+        with open(key_path, "w") as f:
+            f.write(private_key)
+        os.chmod(key_path, 0o600)
+
+        cert_path = os.path.join(msp_dir, "signcerts", "cert.pem")
+        with open(cert_path, "w") as f:
+            f.write(certificate)
+        if ca_chain:
+            with open(os.path.join(msp_dir, "cacerts", "ca.pem"), "w") as f:
+                f.write(ca_chain)
+        return cert_path
+
+    async def register(self, registrar: Tuple[bytes, Any], registration: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register an identity
+
+        Args:
+            registrar: (cert_pem, private_key) of the registrar, see load_msp_identity()
+            registration: Request body, e.g. {"id", "secret", "type", "affiliation", "max_enrollments"}
+
+        Returns:
+            Dict with success and secret (the CA generates one if none was given)
+        """
+        response = await self._post("/api/v1/register", registration, identity=registrar)
+        if not response["success"]:
+            return response
+        return {"success": True, "secret": response["result"].get("secret", registration.get("secret"))}
+
+    async def revoke(self, registrar: Tuple[bytes, Any], enrollment_id: str, reason: str = "unspecified") -> Dict[str, Any]:
+        """Revoke all certificates of an enrollment ID"""
+        response = await self._post(
+            "/api/v1/revoke", {"id": enrollment_id, "reason": reason}, identity=registrar
+        )
+        if not response["success"]:
+            return response
+        return {"success": True, "result": response["result"]}
@@ -14,10 +14,15 @@ Security features:
 - Expiration checking
 - Secure password policies
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Union, Dict
+import hashlib
+import hmac
 import logging
-from jose import JWTError, jwt
+import threading
+import time
+from jose import ExpiredSignatureError, JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.config import settings
@@ -32,6 +37,24 @@ pwd_context = CryptContext(
     bcrypt__rounds=12  # Cost factor (higher = more secure but slower)
 )
 
+# Recently verified (password, hash) pairs, so repeated logins skip bcrypt.
+# Keys are HMAC-SHA256 under SECRET_KEY; someone able to read process memory
+# can only confirm a guess for a pair verified in the last TTL seconds, and
+# that attacker already holds SECRET_KEY. Failures are never cached, so
+# brute-force attempts always pay the full bcrypt cost.
+PASSWORD_CACHE_TTL = 30.0
+PASSWORD_CACHE_SIZE = 1024
+_verified_passwords: "OrderedDict[bytes, float]" = OrderedDict()
+_verified_passwords_lock = threading.Lock()
+
+
+def _password_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{plain_password}\0{hashed_password}".encode(),
+        hashlib.sha256
+    ).digest()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -47,11 +70,28 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Note:
         Uses constant-time comparison to prevent timing attacks
     """
+    key = _password_cache_key(plain_password, hashed_password)
+    now = time.monotonic()
+    with _verified_passwords_lock:
+        expires_at = _verified_passwords.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                return True
+            del _verified_passwords[key]
+    
     try:
-        return pwd_context.verify(plain_password, hashed_password)
+        verified = pwd_context.verify(plain_password, hashed_password)
     except Exception as e:
         logger.error(f"Password verification error: {type(e).__name__}")
         return False
+    
+    if verified:
+        with _verified_passwords_lock:
+            _verified_passwords[key] = now + PASSWORD_CACHE_TTL
+            _verified_passwords.move_to_end(key)
+            if len(_verified_passwords) > PASSWORD_CACHE_SIZE:
+                _verified_passwords.popitem(last=False)
+    return verified
 
 
 def get_password_hash(password: str) -> str:
@@ -172,36 +212,40 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     return encoded_jwt
 
 
+# Resolved once; jwt.decode verifies the signature and exp, and rejects
+# tokens missing any of these claims, in a single pass
+_DECODE_ALGORITHMS = [settings.ALGORITHM]
+_DECODE_OPTIONS = {"require_exp": True, "require_sub": True, "require_type": True}
+
+
 def verify_token(token: str, token_type: str = "access") -> dict:
     """Verify and decode JWT token"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        # Check token type
-        if payload.get("type") != token_type:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Invalid token type. Expected {token_type}",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Check expiration
-        exp = payload.get("exp")
-        if exp is None or datetime.utcnow() > datetime.fromtimestamp(exp):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has expired",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        return payload
-        
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=_DECODE_ALGORITHMS, options=_DECODE_OPTIONS
+        )
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    # Check token type
+    if payload["type"] != token_type:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid token type. Expected {token_type}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return payload
 
 
 def get_user_id_from_token(token: str) -> str:
@@ -0,0 +1,18 @@
+"""
+Backend Phase 3 - Audit Log Partition Script
+Pre-creates monthly audit_logs partitions. The backend already does this on
+startup and daily while running; use this for extra months ahead, e.g.:
+    python scripts/create_audit_partitions.py 12
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import engine
+from app.services.audit_service import ensure_audit_log_partitions
+
+
+if __name__ == "__main__":
+    months_ahead = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    ensure_audit_log_partitions(engine, months_ahead)
+    print("Audit log partitions created/verified")
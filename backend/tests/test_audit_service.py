@@ -0,0 +1,131 @@
+"""
+Test suite for Audit Service
+Tests buffered audit log writes
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy.orm import Session
+from app.services.audit_service import AuditService, AuditBatcher
+from app.models.audit import AuditLog
+
+
+class TestAuditService:
+    """Test cases for AuditService.log_event"""
+    
+    def test_log_event_writes_through_session_without_batcher(self):
+        """Test events are committed directly when no background writer runs"""
+        db = Mock(spec=Session)
+        with patch('app.services.audit_service.audit_batcher') as batcher:
+            batcher.running = False
+            AuditService(db).log_event(user_id=None, action="TEST")
+        
+        batcher.enqueue.assert_not_called()
+        added = db.add.call_args[0][0]
+        assert isinstance(added, AuditLog)
+        assert added.action == "TEST"
+        assert added.timestamp is not None
+        db.commit.assert_called_once()
+    
+    def test_log_event_enqueues_when_batcher_running(self):
+        """Test events are buffered instead of touching the session"""
+        db = Mock(spec=Session)
+        with patch('app.services.audit_service.audit_batcher') as batcher:
+            batcher.running = True
+            AuditService(db).log_event(user_id=None, action="TEST", resource_type="user")
+        
+        row = batcher.enqueue.call_args[0][0]
+        assert row["action"] == "TEST"
+        assert row["resource_type"] == "user"
+        db.add.assert_not_called()
+        db.commit.assert_not_called()
+    
+    def test_log_events_joins_caller_transaction(self):
+        """Test batch logging adds rows without committing when no writer runs"""
+        db = Mock(spec=Session)
+        with patch('app.services.audit_service.audit_batcher') as batcher:
+            batcher.running = False
+            AuditService(db).log_events([
+                {"user_id": None, "action": "A"},
+                {"user_id": None, "action": "B", "details": {"k": 1}},
+            ])
+        
+        added = db.add_all.call_args[0][0]
+        assert [log.action for log in added] == ["A", "B"]
+        db.commit.assert_not_called()
+
+
+class TestAuditBatcher:
+    """Test cases for AuditBatcher"""
+    
+    def test_flush_splits_into_batches(self):
+        """Test flush writes everything in max_batch sized chunks"""
+        batcher = AuditBatcher(Mock(), max_batch=2)
+        batches = []
+        batcher._insert = batches.append
+        for i in range(5):
+            batcher.enqueue({"action": str(i)})
+        
+        batcher.flush()
+        
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert [row["action"] for b in batches for row in b] == ["0", "1", "2", "3", "4"]
+    
+    def test_run_drains_in_background(self):
+        """Test the background writer picks up enqueued rows"""
+        batcher = AuditBatcher(Mock(), interval=0.01)
+        batches = []
+        batcher._insert = batches.append
+        
+        async def scenario():
+            task = asyncio.create_task(batcher.run())
+            await asyncio.sleep(0.02)
+            assert batcher.running
+            batcher.enqueue({"action": "A"})
+            batcher.enqueue({"action": "B"})
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        
+        asyncio.run(scenario())
+        
+        assert batches == [[{"action": "A"}, {"action": "B"}]]
+        assert not batcher.running
+    
+    def test_failed_batch_is_kept_for_retry(self):
+        """Test a database outage puts the batch back instead of dropping it"""
+        from sqlalchemy.exc import OperationalError
+        
+        bind = Mock()
+        bind.begin.side_effect = OperationalError("INSERT", {}, Exception("down"))
+        batcher = AuditBatcher(bind, max_batch=2)
+        for i in range(3):
+            batcher.enqueue({"action": str(i)})
+        
+        batcher.flush()
+        
+        assert bind.begin.call_count == 1
+        assert [row["action"] for row in batcher._pending] == ["0", "1", "2"]
+    
+    def test_bad_row_is_dropped_alone(self):
+        """Test a row rejected by the database does not take the batch with it"""
+        from sqlalchemy.exc import IntegrityError
+        
+        written = []
+        
+        def execute(statement, rows):
+            if any(row["action"] == "bad" for row in rows):
+                raise IntegrityError("INSERT", {}, Exception("fk violation"))
+            written.extend(rows)
+        
+        bind = Mock()
+        bind.begin.return_value.__enter__ = Mock(return_value=Mock(execute=execute))
+        bind.begin.return_value.__exit__ = Mock(return_value=False)
+        batcher = AuditBatcher(bind)
+        for action in ("A", "bad", "B"):
+            batcher.enqueue({"action": action})
+        
+        batcher.flush()
+        
+        assert [row["action"] for row in written] == ["A", "B"]
+        assert not batcher._pending
@@ -214,7 +214,7 @@ class TestChaincodeService:
         # Arrange
         user_id = uuid4()
         mock_chaincodes = [Mock(spec=Chaincode), Mock(spec=Chaincode)]
-        mock_db.query.return_value.filter.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = mock_chaincodes
+        mock_db.query.return_value.options.return_value.filter.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = mock_chaincodes
         
         # Act
         result = chaincode_service.get_chaincodes(
@@ -226,7 +226,7 @@ class TestChaincodeService:
         
         # Assert
         assert result == mock_chaincodes
-        assert mock_db.query.return_value.filter.call_count >= 1
+        assert mock_db.query.return_value.options.return_value.filter.call_count >= 1
 
 
 if __name__ == "__main__":
@@ -5,10 +5,14 @@ Tests authentication, rate limiting, and security headers
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from fastapi import Request, HTTPException
+from starlette.datastructures import Headers, State
 from datetime import datetime, timedelta
+import time
+from collections import deque
 from app.middleware.auth_cookie import OAuth2PasswordBearerWithCookie
-from app.middleware.rate_limit import RateLimiter
+from app.middleware.rate_limit import RateLimiter, RateLimitMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.middleware.timing import ProcessTimeMiddleware
 
 
 class TestAuthCookieMiddleware:
@@ -29,7 +33,7 @@ class TestAuthCookieMiddleware:
         request.headers = {"Authorization": "Bearer test-token-123"}
         request.cookies = {}
         request.client = Mock(host="127.0.0.1")
-        request.state = Mock()
+        request.state = State()
         
         # Act
         token = await oauth_scheme(request)
@@ -46,7 +50,7 @@ class TestAuthCookieMiddleware:
         request.headers = {}
         request.cookies = {"access_token": "cookie-token-456"}
         request.client = Mock(host="127.0.0.1")
-        request.state = Mock()
+        request.state = State()
         
         # Act
         token = await oauth_scheme(request)
@@ -63,7 +67,7 @@ class TestAuthCookieMiddleware:
         request.headers = {"Authorization": "Bearer header-token"}
         request.cookies = {"access_token": "cookie-token"}
         request.client = Mock(host="127.0.0.1")
-        request.state = Mock()
+        request.state = State()
         
         # Act
         token = await oauth_scheme(request)
@@ -72,6 +76,24 @@ class TestAuthCookieMiddleware:
         assert token == "header-token"
         assert request.state.auth_source == "header"
     
+    @pytest.mark.asyncio
+    async def test_token_reused_from_request_state(self, oauth_scheme):
+        """Test that a token extracted earlier in the request is reused"""
+        # Arrange
+        request = Mock(spec=Request)
+        request.headers = {"Authorization": "Bearer test-token-123"}
+        request.cookies = {}
+        request.client = Mock(host="127.0.0.1")
+        request.state = State()
+        await oauth_scheme(request)
+        request.headers = {}
+        
+        # Act
+        token = await oauth_scheme(request)
+        
+        # Assert
+        assert token == "test-token-123"
+    
     @pytest.mark.asyncio
     async def test_no_token_raises_401(self, oauth_scheme):
         """Test that missing token raises 401 Unauthorized"""
@@ -80,6 +102,7 @@ class TestAuthCookieMiddleware:
         request.headers = {}
         request.cookies = {}
         request.client = Mock(host="127.0.0.1")
+        request.state = State()
         
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
@@ -96,6 +119,7 @@ class TestAuthCookieMiddleware:
         request.headers = {"Authorization": "InvalidFormat"}
         request.cookies = {}
         request.client = Mock(host="127.0.0.1")
+        request.state = State()
         
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
@@ -202,17 +226,58 @@ class TestRateLimiter:
         endpoint = "/api/test"
         
         # Add old and new requests
-        old_time = datetime.now() - timedelta(seconds=120)
-        new_time = datetime.now()
+        new_time = time.monotonic_ns()
+        old_time = new_time - 120 * 1_000_000_000
         
-        rate_limiter.requests[ip][endpoint] = [old_time, new_time]
+        rate_limiter.requests[(ip, endpoint)] = deque([old_time, new_time])
         
         # Cleanup with 60 second window
         rate_limiter._cleanup_old_requests(ip, endpoint, 60)
         
         # Only new request should remain
-        assert len(rate_limiter.requests[ip][endpoint]) == 1
-        assert rate_limiter.requests[ip][endpoint][0] == new_time
+        assert len(rate_limiter.requests[(ip, endpoint)]) == 1
+        assert rate_limiter.requests[(ip, endpoint)][0] == new_time
+    
+    @pytest.mark.asyncio
+    async def test_sweep_removes_idle_clients(self, rate_limiter, mock_request):
+        """Test that sweeping drops expired buckets and lockouts"""
+        await rate_limiter.check_rate_limit(mock_request, max_requests=5, window_seconds=60)
+        
+        # Age the request and add an expired lockout
+        rate_limiter.requests[("127.0.0.1", "/api/test")][0] -= 120 * 1_000_000_000
+        rate_limiter.lockouts[("10.0.0.1", "/api/test")] = time.monotonic_ns() - 1
+        
+        rate_limiter.sweep()
+        
+        assert not rate_limiter.requests
+        assert not rate_limiter.lockouts
+
+
+class TestRateLimitMiddleware:
+    """Test ASGI rate limiting middleware"""
+    
+    @pytest.mark.asyncio
+    async def test_only_listed_paths_are_limited(self):
+        """Test that listed paths get 429 over the limit and others pass"""
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+        
+        middleware = RateLimitMiddleware(app, limiter=RateLimiter(), paths={"/limited": (1, 60, 1)})
+        
+        async def status_for(path):
+            messages = []
+            
+            async def send(message):
+                messages.append(message)
+            
+            scope = {"type": "http", "path": path, "headers": [], "client": ("127.0.0.1", 1234)}
+            await middleware(scope, AsyncMock(), send)
+            return messages[0]["status"]
+        
+        assert await status_for("/limited") == 200
+        assert await status_for("/limited") == 429
+        assert await status_for("/other") == 200
 
 
 class TestSecurityHeadersMiddleware:
@@ -222,55 +287,52 @@ class TestSecurityHeadersMiddleware:
     def middleware(self):
         return SecurityHeadersMiddleware(app=Mock())
     
+    async def _response_headers(self, middleware, app_headers):
+        """Run the middleware around a dummy app and return the response headers"""
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": app_headers})
+            await send({"type": "http.response.body", "body": b"test"})
+        
+        messages = []
+        
+        async def send(message):
+            messages.append(message)
+        
+        middleware.app = app
+        await middleware({"type": "http", "path": "/api/test"}, AsyncMock(), send)
+        return Headers(raw=messages[0]["headers"])
+    
     @pytest.mark.asyncio
     async def test_security_headers_added(self, middleware):
         """Test that all security headers are added"""
-        # Arrange
-        request = Mock(spec=Request)
-        request.url = Mock(path="/api/test")
-        
-        async def dummy_call_next(req):
-            from starlette.responses import Response
-            return Response(content="test", status_code=200)
-        
         # Act
-        response = await middleware.dispatch(request, dummy_call_next)
+        headers = await self._response_headers(middleware, [])
         
         # Assert essential headers
-        assert "X-Content-Type-Options" in response.headers
-        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "X-Content-Type-Options" in headers
+        assert headers["X-Content-Type-Options"] == "nosniff"
         
-        assert "X-Frame-Options" in response.headers
-        assert response.headers["X-Frame-Options"] == "DENY"
+        assert "X-Frame-Options" in headers
+        assert headers["X-Frame-Options"] == "DENY"
         
-        assert "X-XSS-Protection" in response.headers
-        assert response.headers["X-XSS-Protection"] == "1; mode=block"
+        assert "X-XSS-Protection" in headers
+        assert headers["X-XSS-Protection"] == "1; mode=block"
         
-        assert "Content-Security-Policy" in response.headers
-        assert "Referrer-Policy" in response.headers
-        assert "Permissions-Policy" in response.headers
-        assert "X-Permitted-Cross-Domain-Policies" in response.headers
-        assert "X-Download-Options" in response.headers
-        assert "X-DNS-Prefetch-Control" in response.headers
+        assert "Content-Security-Policy" in headers
+        assert "Referrer-Policy" in headers
+        assert "Permissions-Policy" in headers
+        assert "X-Permitted-Cross-Domain-Policies" in headers
+        assert "X-Download-Options" in headers
+        assert "X-DNS-Prefetch-Control" in headers
     
     @pytest.mark.asyncio
     async def test_server_header_removed(self, middleware):
         """Test that Server header is removed"""
-        # Arrange
-        request = Mock(spec=Request)
-        request.url = Mock(path="/api/test")
-        
-        async def dummy_call_next(req):
-            from starlette.responses import Response
-            response = Response(content="test")
-            response.headers["Server"] = "Uvicorn"
-            return response
-        
         # Act
-        response = await middleware.dispatch(request, dummy_call_next)
+        headers = await self._response_headers(middleware, [(b"server", b"Uvicorn")])
         
         # Assert
-        assert "Server" not in response.headers
+        assert "Server" not in headers
     
     def test_get_csp_for_development(self, middleware):
         """Test CSP for development environment"""
@@ -293,6 +355,30 @@ class TestSecurityHeadersMiddleware:
             assert "upgrade-insecure-requests" in csp
 
 
+class TestProcessTimeMiddleware:
+    """Test request timing middleware"""
+    
+    @pytest.mark.asyncio
+    async def test_process_time_header_added(self):
+        """Test that X-Process-Time-Ms is added as an integer"""
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"test"})
+        
+        messages = []
+        
+        async def send(message):
+            messages.append(message)
+        
+        middleware = ProcessTimeMiddleware(app)
+        await middleware({"type": "http"}, AsyncMock(), send)
+        
+        headers = dict(messages[0]["headers"])
+        assert b"x-process-time-ms" in headers
+        assert headers[b"x-process-time-ms"].isdigit()
+        assert messages[1]["body"] == b"test"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -12,6 +12,8 @@ from app.utils.security import (
     create_access_token,
     verify_token
 )
+from app.utils.fabric_ca_rest import FabricCARestClient, load_msp_identity
+from app.utils.uuid7 import uuid7
 
 
 class TestChaincodeValidator:
@@ -249,6 +251,158 @@ class TestSecurityUtils:
         assert hash1 != hash2
         assert verify_password(password, hash1)
         assert verify_password(password, hash2)
+    
+    def test_verify_password_caches_successes_only(self, monkeypatch):
+        """Test repeated successful checks skip bcrypt; failures never do"""
+        from app.utils import security
+        hashed = get_password_hash("CachedPass123!")
+        calls = []
+        real_verify = security.pwd_context.verify
+        monkeypatch.setattr(
+            security.pwd_context, "verify",
+            lambda plain, h: calls.append(plain) or real_verify(plain, h)
+        )
+        
+        assert verify_password("CachedPass123!", hashed)
+        assert verify_password("CachedPass123!", hashed)
+        assert verify_password("WrongPass", hashed) is False
+        assert verify_password("WrongPass", hashed) is False
+        
+        assert calls == ["CachedPass123!", "WrongPass", "WrongPass"]
+
+
+class TestUUID7:
+    """Test time-ordered UUID generation"""
+    
+    def test_version_and_variant(self):
+        """Test UUIDv7 version and RFC variant bits"""
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+    
+    def test_monotonic(self):
+        """Test IDs generated in sequence sort in generation order"""
+        ids = [uuid7() for _ in range(5000)]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+
+class TestFabricCARestClient:
+    """Test Fabric CA REST enrollment and token auth"""
+    
+    def test_auth_token_signs_request_with_low_s(self):
+        """Test the token carries the cert and a verifiable low-S signature"""
+        import base64
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+        
+        key = ec.generate_private_key(ec.SECP256R1())
+        client = FabricCARestClient("https://ca:8054")
+        token = client._auth_token("POST", "/api/v1/register", b'{"id":"u"}', b"CERT", key)
+        
+        b64_cert, b64_sig = token.split(".")
+        assert base64.b64decode(b64_cert) == b"CERT"
+        signature = base64.b64decode(b64_sig)
+        signed = ".".join([
+            "POST",
+            base64.b64encode(b"/api/v1/register").decode(),
+            base64.b64encode(b'{"id":"u"}').decode(),
+            b64_cert
+        ]).encode()
+        key.public_key().verify(signature, signed, ec.ECDSA(hashes.SHA256()))
+        _, s = decode_dss_signature(signature)
+        assert s <= 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551 // 2
+    
+    def test_enroll_writes_msp(self, tmp_path, monkeypatch):
+        """Test enroll posts a CSR with basic auth and writes the MSP layout"""
+        import asyncio
+        import base64
+        import httpx
+        from app.utils import fabric_ca_rest
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={
+                "success": True,
+                "result": {"Cert": base64.b64encode(b"ISSUED").decode(), "ServerInfo": {}}
+            })
+        
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock_client:
+                monkeypatch.setattr(fabric_ca_rest, "get_ca_http_client", lambda: mock_client)
+                return await FabricCARestClient("https://ca:8054").enroll(
+                    "user1", "secret", msp_dir=str(tmp_path)
+                )
+        
+        result = asyncio.run(scenario())
+        
+        assert result["success"] is True
+        assert result["certificate"] == "ISSUED"
+        assert str(requests[0].url) == "https://ca:8054/api/v1/enroll"
+        assert requests[0].headers["authorization"].startswith("Basic ")
+        assert b"CERTIFICATE REQUEST" in requests[0].content
+        cert_pem, key = load_msp_identity(str(tmp_path))
+        assert cert_pem == b"ISSUED"
+        assert key is not None
+    
+    def _post_with_registrar(self, monkeypatch, call, result):
+        """Run a token-signed call against a mock CA client that has default Basic auth"""
+        import asyncio
+        import httpx
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from app.utils import fabric_ca_rest
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"success": True, "result": result})
+        
+        async def scenario():
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler), auth=("admin", "adminpw")
+            ) as mock_client:
+                monkeypatch.setattr(fabric_ca_rest, "get_ca_http_client", lambda: mock_client)
+                registrar = (b"ADMINCERT", ec.generate_private_key(ec.SECP256R1()))
+                return await call(FabricCARestClient("https://ca:8054"), registrar)
+        
+        return asyncio.run(scenario()), requests
+    
+    def test_register_sends_token_not_basic_auth(self, monkeypatch):
+        """Test register is authorized with the registrar token, not the client's Basic auth"""
+        import base64
+        
+        result, requests = self._post_with_registrar(
+            monkeypatch,
+            lambda ca, registrar: ca.register(registrar, {"id": "user2", "type": "client"}),
+            {"secret": "generated"}
+        )
+        
+        assert result == {"success": True, "secret": "generated"}
+        assert str(requests[0].url) == "https://ca:8054/api/v1/register"
+        authorization = requests[0].headers["authorization"]
+        assert not authorization.startswith("Basic ")
+        assert authorization.split(".")[0] == base64.b64encode(b"ADMINCERT").decode()
+    
+    def test_revoke_sends_token_not_basic_auth(self, monkeypatch):
+        """Test revoke is authorized with the registrar token, not the client's Basic auth"""
+        import base64
+        
+        result, requests = self._post_with_registrar(
+            monkeypatch,
+            lambda ca, registrar: ca.revoke(registrar, "user2", "keycompromise"),
+            {"RevokedCerts": []}
+        )
+        
+        assert result["success"] is True
+        assert str(requests[0].url) == "https://ca:8054/api/v1/revoke"
+        assert b'"reason":"keycompromise"' in requests[0].content
+        authorization = requests[0].headers["authorization"]
+        assert not authorization.startswith("Basic ")
+        assert authorization.split(".")[0] == base64.b64encode(b"ADMINCERT").decode()
 
 
 if __name__ == "__main__":